@@ -8,8 +8,10 @@ setup(
     install_requires=[
         "meraki>=1.34.0",
         "pyyaml>=6.0",
-        "pandas>=1.5.0",
         "tk",
     ],
+    extras_require={
+        "speedups": ["orjson>=3.0", "pyarrow>=7.0"],
+    },
     python_requires=">=3.7",
 ) 
\ No newline at end of file
@@ -1,11 +1,17 @@
 """Meraki Auditor package."""
 from .core import MerakiConnection, PlaybookExecutor, ReportGenerator
 from .playbook import Playbook, ApiCall, PlaybookConfig
-from .gui import AuditorGUI
-from .utils import DirectoryManager
+from .utils import DirectoryManager, DeviceCache, NetworkCache
 
 __version__ = "0.1.0"
 
+def __getattr__(name):
+    # The GUI pulls in tkinter, so it is only imported when asked for
+    if name == "AuditorGUI":
+        from .gui import AuditorGUI
+        return AuditorGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "MerakiConnection",
     "PlaybookExecutor",
@@ -15,4 +21,6 @@ __all__ = [
     "PlaybookConfig",
     "AuditorGUI",
     "DirectoryManager",
+    "DeviceCache",
+    "NetworkCache",
 ]
@@ -1,4 +1,7 @@
+import argparse
+import logging
 import sys
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 # Add the src directory to Python path
@@ -6,9 +9,40 @@ src_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(src_dir))
 
 from meraki_auditor.gui import AuditorGUI
+from meraki_auditor.utils import CACHE_TTL, DEVICE_CACHE_TTL_ENV
+
+LOG_FILE = Path.home() / ".cache" / "meraki_auditor" / "auditor.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+def configure_logging(verbose: bool = False):
+    """Log to a rotating file; per-call detail only shows up with --verbose"""
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG if verbose else logging.WARNING)
 
 def main():
-    app = AuditorGUI()
+    parser = argparse.ArgumentParser(description="Meraki Network Auditor")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="execute playbooks with the asyncio executor")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false",
+                        help="always fetch networks and devices from the Dashboard")
+    parser.add_argument("--cache-ttl", type=float, metavar="SECONDS",
+                        help="how long cached networks and devices stay fresh (default: "
+                             f"${DEVICE_CACHE_TTL_ENV} for devices, else {CACHE_TTL})")
+    parser.add_argument("--raw", dest="keep_raw", action="store_true",
+                        help="also save unflattened API responses as raw_results.pkl")
+    parser.add_argument("--verbose", action="store_true",
+                        help="echo the report execution log to stdout and log every API call")
+    args = parser.parse_args()
+    
+    configure_logging(args.verbose)
+    app = AuditorGUI(use_async=args.use_async, use_cache=args.use_cache,
+                     keep_raw=args.keep_raw, cache_ttl=args.cache_ttl,
+                     verbose=args.verbose)
     app.run()
 
 if __name__ == "__main__":
@@ -1,20 +1,190 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-import yaml
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterator, Set
 from pathlib import Path
-import meraki
+import csv
 import json
 import logging
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import lru_cache
 from .playbook import Playbook, ApiCall, PlaybookConfig
-from .utils import DirectoryManager
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+from .utils import DirectoryManager, DeviceCache, NetworkCache, REPORT_TIMESTAMP_FORMAT
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Meraki caps concurrent API sessions at roughly five per organization
+MAX_WORKERS = 5
+
+# Keep-alive pool for the SDK session, sized to the concurrency cap above
+POOL_CONNECTIONS = 5
+POOL_MAXSIZE = 10
+REQUEST_TIMEOUT = 60
+
+# Minimum seconds between progress callbacks (~20 Hz)
+PROGRESS_INTERVAL = 0.05
+
+# Retry policy for 429 rate-limit responses
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_JITTER = 0.5
+
+# Meraki allows about ten requests per second per organization; the client
+# rate halves on each 429 and climbs back by RATE_RECOVERY per success
+RATE_LIMIT = 10.0
+RATE_FLOOR = 1.0
+RATE_RECOVERY = 0.5
+
+# Organization enumeration settings
+ORG_WORKERS = 3
+NETWORKS_PER_PAGE = 1000
+
+# Device inventories are listed per organization, this many networks per call
+DEVICE_BATCH_SIZE = 100
+DEVICES_PER_PAGE = 1000
+
+# Report logs are written in per-section batches through a 1 MiB buffer
+LOG_BUFFER_SIZE = 1 << 20
+
+# Context columns that lead every report row
+ROW_CONTEXT = ('network', 'deviceName', 'deviceSerial', 'deviceModel', 'deviceType')
+_ROW_TEMPLATE = dict.fromkeys(ROW_CONTEXT, '')
+
+def _to_json(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def _dump_json(obj: Any, path: Path):
+    """Write obj to path as indented JSON, in binary so orjson's bytes go straight out"""
+    with open(path, 'wb') as f:
+        f.write(_to_json(obj))
+
+def _csv_cell(value: Any) -> Optional[str]:
+    """Render a value the way csv.writer would"""
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+@lru_cache(maxsize=None)
+def _arrow() -> Optional[Tuple[Any, Any]]:
+    """PyArrow and its CSV module, imported on the first report write"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:  # optional speedup, the csv module is used otherwise
+        return None
+    return pa, pa_csv
+
+def _write_csv(csv_path: Path, columns: List[str], rows: List[Dict],
+               constants: Optional[Dict[str, Any]] = None):
+    """Write rows to CSV, through PyArrow's C++ writer when it is installed"""
+    # Constant columns are appended at write time so the rows are never mutated;
+    # a constant replaces any row column of the same name, whichever writer runs
+    constants = constants or {}
+    columns = [col for col in columns if col not in constants]
+    arrow = _arrow()
+    if arrow is not None:
+        pa, pa_csv = arrow
+        table = {col: [_csv_cell(row.get(col)) for row in rows] for col in columns}
+        table.update((col, [_csv_cell(value)] * len(rows)) for col, value in constants.items())
+        pa_csv.write_csv(pa.table(table), csv_path)
+        return
+    
+    tail = list(constants.values())
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns + list(constants))
+        writer.writerows([row.get(col) for col in columns] + tail for row in rows)
+
+def _flatten_row(context: Dict, data: Any) -> Dict:
+    """Merge the top level of an API response into a row of context columns"""
+    # Copy and update run entirely in C, with no per-key bytecode
+    row = _ROW_TEMPLATE.copy()
+    row.update(context)
+    if isinstance(data, list):
+        data = data[0] if data and isinstance(data[0], dict) else None
+    if isinstance(data, dict):
+        row.update(data)
+    return row
+
+def _collect_schema(rows: List[Dict]) -> Tuple[List[str], Dict[str, str]]:
+    """Union the row keys in first-seen order and type each column, in one pass"""
+    kinds: Dict[str, set] = {}
+    filled: Dict[str, int] = {}
+    for row in rows:
+        for key, value in row.items():
+            seen = kinds.get(key)
+            if seen is None:
+                seen = kinds[key] = set()
+                filled[key] = 0
+            if value is not None:
+                seen.add(type(value))
+                filled[key] += 1
+    
+    schema = {key: _column_type(seen, filled[key] < len(rows)) for key, seen in kinds.items()}
+    return list(kinds), schema
+
+def _column_type(seen: set, missing: bool) -> str:
+    """Map the value types found in a CSV column to a pandas-style dtype name"""
+    if seen == {bool}:
+        # pandas can't hold NaN in a bool column and falls back to object
+        return 'object' if missing else 'bool'
+    if seen == {int}:
+        return 'float64' if missing else 'int64'
+    if seen and seen <= {int, float}:
+        return 'float64'
+    return 'object'
+
+def _retry_after(headers: Any) -> float:
+    """Seconds requested by a Retry-After header, or 0 if absent or unparseable"""
+    try:
+        return float((headers or {}).get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+def _backoff_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited call"""
+    retry_after = _retry_after(getattr(getattr(error, 'response', None), 'headers', None))
+    return max(retry_after, BACKOFF_BASE * 2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+
+def _call_with_backoff(fn: Callable, slots: Optional[threading.Semaphore] = None,
+                       limiter: Optional['TokenBucket'] = None, **kwargs) -> Any:
+    """Call an SDK method, backing off exponentially on 429 responses"""
+    import meraki
+    for attempt in range(MAX_RETRIES):
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            # Hold a request slot only while the call is in flight, not while backing off
+            with slots or nullcontext():
+                return fn(**kwargs)
+        except meraki.APIError as e:
+            if e.status != 429 or attempt == MAX_RETRIES - 1:
+                raise
+            delay = _backoff_delay(e, attempt)
+            logger.warning(f"Rate limited, retrying in {delay:.1f} seconds")
+            time.sleep(delay)
+
 @dataclass
 class ReportMetadata:
+    __slots__ = ('name', 'type', 'version', 'description', 'author', 'date',
+                 'duration', 'playbook_name')
+    
     name: str
     type: str
     version: str
@@ -24,16 +194,117 @@ class ReportMetadata:
     duration: float
     playbook_name: str
 
+@dataclass
+class CompiledStep:
+    """A playbook step with its SDK method and base parameters resolved at load time"""
+    __slots__ = ('step', 'bound_callable', 'param_template', 'call_key', 'error')
+    
+    step: ApiCall
+    bound_callable: Optional[Callable]
+    param_template: Dict[str, Any]
+    # Memo key prefix shared by every call the step makes
+    call_key: Tuple
+    # Resolution failure, raised when the step runs so other steps still execute
+    error: Optional[Exception]
+
+class TokenBucket:
+    """Thread-safe token bucket that slows down on 429s and speeds back up on success"""
+    
+    def __init__(self, rate: float = RATE_LIMIT, capacity: float = RATE_LIMIT):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # last_refill sits in the future while a Retry-After pause is running
+                elapsed = max(0.0, now - self.last_refill)
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                self.last_refill = max(now, self.last_refill)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (self.last_refill - now) + (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def throttle(self, retry_after: float = 0.0):
+        """Halve the rate and hold every caller for the Retry-After period"""
+        with self._lock:
+            self.rate = max(RATE_FLOOR, self.rate / 2)
+            self.tokens = 0.0
+            self.last_refill = max(self.last_refill, time.monotonic() + retry_after)
+    
+    def recover(self):
+        """Creep the rate back towards its ceiling after a successful response"""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + RATE_RECOVERY)
+
 class MerakiConnection:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_cache: bool = True, cache_ttl: Optional[float] = None):
+        # The SDK (and requests under it) is only imported once a connection is made
+        import meraki
+        
         self.api_key = api_key
         self.networks = []
+        self.network_by_id: Dict[str, Dict] = {}
         self.selected_networks = []
         self.devices = {}
-        self.dashboard = meraki.DashboardAPI(api_key, output_log=False, print_console=False)
+        self.device_cache = DeviceCache(ttl=cache_ttl) if use_cache else None
+        self.network_cache = NetworkCache(api_key, ttl=cache_ttl) if use_cache else None
+        # One request budget shared by every pool that calls through this connection
+        self.request_slots = threading.BoundedSemaphore(MAX_WORKERS)
+        self.rate_limiter = TokenBucket()
+        # call() retries 429s itself, so the SDK raises them instead of waiting and retrying too
+        self.dashboard = meraki.DashboardAPI(api_key, output_log=False, print_console=False,
+                                             single_request_timeout=REQUEST_TIMEOUT,
+                                             maximum_retries=MAX_RETRIES, wait_on_rate_limit=False)
+        self._mount_connection_pool()
         self.progress_callback = None
         self.status_callback = None
     
+    @staticmethod
+    def _api_errors() -> Tuple[type, ...]:
+        """Errors that mean the Dashboard rejected an enumeration call"""
+        import meraki
+        return (meraki.APIError,)
+    
+    def _mount_connection_pool(self):
+        """Reuse pooled keep-alive connections for every Dashboard API call"""
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        rest_session = getattr(self.dashboard, '_session', None)
+        req_session = getattr(rest_session, '_req_session', None)
+        if req_session is None:
+            logger.warning("Meraki SDK session not found, connection pooling disabled")
+            return
+        
+        # 429s are left to call(), which honours Retry-After itself
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                              max_retries=retries)
+        req_session.mount('https://', adapter)
+        req_session.headers['Connection'] = 'keep-alive'
+        
+        # Every response, including the SDK's own retries, feeds the shared rate limiter
+        req_session.hooks.setdefault('response', []).append(self._on_response)
+    
+    def _on_response(self, response, *args, **kwargs):
+        """requests response hook that adapts the request rate to 429s"""
+        if response.status_code == 429:
+            retry_after = _retry_after(response.headers)
+            logger.warning(f"Rate limited by Dashboard, pausing requests for {retry_after:.1f} seconds")
+            self.rate_limiter.throttle(retry_after)
+        elif response.status_code < 400:
+            self.rate_limiter.recover()
+    
     def set_callbacks(self, progress_callback=None, status_callback=None):
         """Set callbacks for progress and status updates"""
         self.progress_callback = progress_callback
@@ -50,6 +321,10 @@ class MerakiConnection:
             self.status_callback(status)
         logger.info(status)
     
+    def call(self, fn: Callable, **kwargs) -> Any:
+        """Call an SDK method within the connection's shared request budget"""
+        return _call_with_backoff(fn, slots=self.request_slots, limiter=self.rate_limiter, **kwargs)
+    
     def authenticate(self) -> bool:
         try:
             self.update_status("Authenticating with Meraki Dashboard...")
@@ -57,76 +332,190 @@ class MerakiConnection:
             
             # Test authentication by getting organizations
             logger.info("API Call: getOrganizations")
-            self.dashboard.organizations.getOrganizations()
+            self.call(self.dashboard.organizations.getOrganizations)
             
             self.update_status("Authentication successful")
             self.update_progress(100)
             return True
-            
-        except meraki.APIError as e:
+        
+        except self._api_errors() as e:
             error_msg = f"Authentication failed: {str(e)}"
             logger.error(error_msg)
             self.update_status(error_msg)
             return False
     
     def load_networks(self) -> List[Dict]:
+        cached = self.network_cache.load() if self.network_cache is not None else None
+        if cached is not None:
+            self.networks = cached
+            self.network_by_id = {n['id']: n for n in cached}
+            self.update_status(f"Loaded {len(cached)} cached networks")
+            self.update_progress(100)
+            return cached
+        
         try:
             self.update_status("Loading organizations...")
             self.update_progress(0)
             
             logger.info("API Call: getOrganizations")
-            orgs = self.dashboard.organizations.getOrganizations()
+            orgs = self.call(self.dashboard.organizations.getOrganizations)
             
             self.update_status(f"Found {len(orgs)} organizations")
             self.update_progress(20)
             
-            networks = []
-            for idx, org in enumerate(orgs, 1):
-                self.update_status(f"Loading networks for organization {idx}/{len(orgs)}: {org['name']}")
-                
-                logger.info(f"API Call: getOrganizationNetworks for org {org['name']}")
-                org_networks = self.dashboard.organizations.getOrganizationNetworks(org['id'])
-                networks.extend(org_networks)
-                
-                # Update progress (20-90% range for loading networks)
-                progress = 20 + (idx / len(orgs) * 70)
-                self.update_progress(progress)
-            
+            org_networks = self._fetch_all_org_networks(orgs)
+            networks = [network for nets in org_networks for network in nets]
             self.networks = networks
+            self.network_by_id = {n['id']: n for n in networks}
+            
+            if self.network_cache is not None:
+                try:
+                    self.network_cache.save(networks)
+                except OSError as e:
+                    logger.warning(f"Failed to save network cache: {e}")
             
             self.update_status(f"Loaded {len(networks)} networks from {len(orgs)} organizations")
             self.update_progress(100)
             
             return networks
             
-        except meraki.APIError as e:
+        except self._api_errors() as e:
             error_msg = f"Failed to load networks: {str(e)}"
             logger.error(error_msg)
             self.update_status(error_msg)
             raise ConnectionError(error_msg)
     
+    def _fetch_all_org_networks(self, orgs: List[Dict]) -> List[List[Dict]]:
+        """Fetch the networks of every organization, in organization order"""
+        # Organizations are independent, so fetch their networks concurrently
+        org_networks = [None] * len(orgs)
+        with ThreadPoolExecutor(max_workers=ORG_WORKERS) as pool:
+            futures = {pool.submit(self._load_org_networks, org): idx for idx, org in enumerate(orgs)}
+            for done, future in enumerate(as_completed(futures), 1):
+                idx = futures[future]
+                org_networks[idx] = future.result()
+                self._org_loaded(orgs[idx], done, len(orgs))
+        return org_networks
+    
+    def _org_loaded(self, org: Dict, done: int, total: int):
+        """Report that one more organization's networks have arrived"""
+        self.update_status(f"Loaded networks for organization {done}/{total}: {org['name']}")
+        
+        # Update progress (20-90% range for loading networks)
+        progress = 20 + (done / total * 70)
+        self.update_progress(progress)
+    
+    def _load_org_networks(self, org: Dict) -> List[Dict]:
+        """Fetch every page of networks for one organization"""
+        logger.info(f"API Call: getOrganizationNetworks for org {org['name']}")
+        return self.call(self.dashboard.organizations.getOrganizationNetworks,
+                         organizationId=org['id'], total_pages='all', perPage=NETWORKS_PER_PAGE)
+    
     def select_networks(self, network_ids: List[str]):
         """Select networks and cache their devices"""
-        self.selected_networks = [n for n in self.networks if n['id'] in network_ids]
+        ids = set(network_ids)
+        self.selected_networks = [n for n in self.networks if n['id'] in ids]
         self.update_status(f"Selected {len(self.selected_networks)} networks")
         
-        # Pre-cache devices for selected networks
+        # Serve what we can from the on-disk cache
+        to_fetch = []
         for network in self.selected_networks:
-            try:
-                devices = self.dashboard.networks.getNetworkDevices(networkId=network['id'])
+            devices = None
+            if self.device_cache is not None:
+                devices = self.device_cache.get(network['id'])
+            if devices is None:
+                to_fetch.append(network)
+            else:
                 self.devices[network['id']] = devices
-                self.update_status(f"Loaded {len(devices)} devices from {network['name']}")
-            except Exception as e:
-                logger.error(f"Failed to load devices for network {network['name']}: {e}")
+                self.update_status(f"Loaded {len(devices)} cached devices from {network['name']}")
+        
+        # Pre-cache devices for the remaining networks
+        for network, devices in self.fetch_devices(to_fetch):
+            if isinstance(devices, Exception):
+                logger.error(f"Failed to load devices for network {network['name']}: {devices}")
+                continue
+            self.remember_devices(network, devices)
+            self.update_status(f"Loaded {len(devices)} devices from {network['name']}")
+    
+    def remember_devices(self, network: Dict, devices: List[Dict]):
+        """Keep a network's devices for this session and in the on-disk cache"""
+        self.devices[network['id']] = devices
+        if self.device_cache is not None:
+            try:
+                self.device_cache.put(network['id'], devices)
+            except OSError as e:
+                logger.warning(f"Failed to cache devices for network {network['name']}: {e}")
+    
+    def fetch_devices(self, networks: List[Dict]) -> Iterator[Tuple[Dict, Any]]:
+        """Yield (network, devices) pairs, with the exception in place of devices on failure"""
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {pool.submit(self._fetch_device_batch, org_id, batch): batch
+                       for org_id, batch in self._device_batches(networks)}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    by_network = future.result()
+                except Exception as e:
+                    for network in batch:
+                        yield network, e
+                    continue
+                for network in batch:
+                    yield network, by_network.get(network['id'], [])
+    
+    @staticmethod
+    def _device_batches(networks: List[Dict]) -> Iterator[Tuple[Optional[str], List[Dict]]]:
+        """Group networks by organization, DEVICE_BATCH_SIZE at a time"""
+        by_org: Dict[Optional[str], List[Dict]] = {}
+        for network in networks:
+            by_org.setdefault(network.get('organizationId'), []).append(network)
+        
+        for org_id, org_networks in by_org.items():
+            # Networks with no known organization are listed one at a time
+            size = DEVICE_BATCH_SIZE if org_id else 1
+            for start in range(0, len(org_networks), size):
+                yield org_id, org_networks[start:start + size]
+    
+    def _fetch_device_batch(self, org_id: Optional[str], batch: List[Dict]) -> Dict[str, List[Dict]]:
+        """List the devices of a batch of networks, keyed by network id"""
+        if not org_id:
+            network = batch[0]
+            return {network['id']: self.call(self.dashboard.networks.getNetworkDevices,
+                                             networkId=network['id'])}
+        
+        # One organization-wide listing, filtered to the batch, replaces a call per network
+        logger.info(f"API Call: getOrganizationDevices for {len(batch)} networks in org {org_id}")
+        devices = self.call(self.dashboard.organizations.getOrganizationDevices,
+                            organizationId=org_id, total_pages='all', perPage=DEVICES_PER_PAGE,
+                            networkIds=[n['id'] for n in batch])
+        return self._devices_by_network(devices)
+    
+    @staticmethod
+    def _devices_by_network(devices: List[Dict]) -> Dict[str, List[Dict]]:
+        """Split an organization device listing up by network id"""
+        by_network: Dict[str, List[Dict]] = {}
+        for device in devices:
+            by_network.setdefault(device.get('networkId'), []).append(device)
+        return by_network
 
 class PlaybookExecutor:
-    def __init__(self, connection: MerakiConnection):
+    def __init__(self, connection: MerakiConnection, keep_raw: bool = False):
         self.connection = connection
         self.current_playbook: Optional[Playbook] = None
         self.results: Dict[str, Any] = {}
+        self.keep_raw = keep_raw
+        self.raw_results: Dict[str, List[Dict]] = {}
+        self._call_cache: Dict[Tuple, Any] = {}
+        # Call keys made by more than one step; only their responses are kept during a run
+        self._repeated_call_keys: Set[Tuple] = set()
+        self._compiled_steps: List[CompiledStep] = []
+        self._compiled_for: Optional[Playbook] = None
         self.devices: Dict[str, List[Dict]] = {}
+        # Restrict device-level steps to one productType; None runs every cached device
+        self.device_type: Optional[str] = None
         self.progress_callback = None
         self.status_callback = None
+        self._callback_lock = threading.Lock()
+        self._last_progress_ts = 0.0
     
     def set_callbacks(self, progress_callback=None, status_callback=None):
         """Set callbacks for progress and status updates"""
@@ -134,78 +523,123 @@ class PlaybookExecutor:
         self.status_callback = status_callback
     
     def update_progress(self, progress: float):
-        """Update progress bar"""
+        """Update progress bar, at most once per PROGRESS_INTERVAL"""
         if self.progress_callback:
-            self.progress_callback(progress)
+            with self._callback_lock:
+                now = time.monotonic()
+                if progress < 100 and now - self._last_progress_ts < PROGRESS_INTERVAL:
+                    return
+                self._last_progress_ts = now
+                self.progress_callback(progress)
     
     def update_status(self, status: str):
         """Update status message"""
         if self.status_callback:
-            self.status_callback(status)
+            with self._callback_lock:
+                self.status_callback(status)
         logger.info(status)
     
     def load_playbook(self, playbook_path: Path) -> Playbook:
         playbook = Playbook(playbook_path)
         playbook.load()
+        return self.use_playbook(playbook)
+    
+    def use_playbook(self, playbook: Playbook) -> Playbook:
+        """Run an already loaded playbook next, compiling its steps"""
         if not playbook.validate():
             raise ValueError("Invalid playbook structure")
         self.current_playbook = playbook
+        self._compiled_steps = self._compile_steps(playbook)
+        self._compiled_for = playbook
         return playbook
     
+    def _compile_steps(self, playbook: Playbook) -> List[CompiledStep]:
+        """Resolve every step's SDK method and base parameters up front"""
+        compiled = []
+        for step in playbook.api_calls:
+            params = dict(step.parameters)
+            call_key = self._call_key(step, params)
+            try:
+                compiled.append(CompiledStep(step, self._resolve_endpoint(step), params, call_key, None))
+            except (AttributeError, ValueError) as e:
+                compiled.append(CompiledStep(step, None, params, call_key, e))
+        counts = Counter(c.call_key for c in compiled)
+        self._repeated_call_keys = {key for key, count in counts.items() if count > 1}
+        return compiled
+    
+    def _steps(self) -> List[CompiledStep]:
+        """Compiled steps for the current playbook, compiling it if it was assigned directly"""
+        if self._compiled_for is not self.current_playbook:
+            self._compiled_steps = self._compile_steps(self.current_playbook)
+            self._compiled_for = self.current_playbook
+        return self._compiled_steps
+    
     def execute(self) -> Dict[str, Any]:
         if not self.current_playbook:
             raise ValueError("No playbook loaded")
         
-        start_time = datetime.now()
-        results = {}
-        total_steps = len(self.current_playbook.api_calls)
-        
-        self.update_status(f"Starting execution of playbook: {self.current_playbook.config.name}")
-        self.update_progress(0)
-        
-        # First, ensure we have devices cached if we need them
-        if any(step.requires_device for step in self.current_playbook.api_calls):
-            self.update_status("Caching devices from networks...")
-            for network in self.connection.selected_networks:
-                if network['id'] not in self.connection.devices:
-                    try:
-                        devices = self.connection.dashboard.networks.getNetworkDevices(networkId=network['id'])
-                        self.connection.devices[network['id']] = [d for d in devices if 'serial' in d]
-                        logger.info(f"Cached {len(devices)} devices from network {network['name']}")
-                    except Exception as e:
-                        logger.error(f"Failed to cache devices for network {network['name']}: {e}")
-        
-        for idx, step in enumerate(self.current_playbook.api_calls, 1):
-            step_progress_base = (idx - 1) / total_steps * 100
-            step_results = []
+        try:
+            start_time = datetime.now()
+            results = {}
+            self.raw_results = {}
+            total_steps = len(self.current_playbook.api_calls)
             
-            self.update_status(f"Executing step {idx}/{total_steps}: {step.name}")
+            self.update_status(f"Starting execution of playbook: {self.current_playbook.config.name}")
+            self.update_progress(0)
             
-            try:
-                if step.requires_device:
-                    # Device-level API call - iterate through cached devices
-                    step_results.extend(self._execute_device_call(step, step_progress_base))
-                else:
-                    # Network-level API call
-                    step_results.extend(self._execute_network_call(step, step_progress_base))
+            # First, ensure we have devices cached if we need them
+            if any(step.requires_device for step in self.current_playbook.api_calls):
+                self.update_status("Caching devices from networks...")
+                for network, devices in self.connection.fetch_devices(self._uncached_networks()):
+                    if isinstance(devices, Exception):
+                        logger.error(f"Failed to cache devices for network {network['name']}: {devices}")
+                    else:
+                        self._cache_network_devices(network, devices)
+            
+            for idx, compiled in enumerate(self._steps(), 1):
+                step = compiled.step
+                step_progress_base = (idx - 1) / total_steps * 100
+                step_results = []
+                
+                self.update_status(f"Executing step {idx}/{total_steps}: {step.name}")
                 
-                results[step.output_folder] = step_results
+                try:
+                    # The SDK method was resolved when the playbook was loaded
+                    if compiled.error is not None:
+                        raise compiled.error
+                    
+                    if step.requires_device:
+                        # Device-level API call - iterate through cached devices
+                        step_results.extend(self._execute_device_call(compiled, step_progress_base))
+                    else:
+                        # Network-level API call
+                        step_results.extend(self._execute_network_call(compiled, step_progress_base))
+                    
+                    results[step.output_folder] = step_results
+                    
+                except Exception as e:
+                    error_msg = f"Failed to execute step {step.name}: {str(e)}"
+                    logger.error(error_msg)
+                    results[step.output_folder] = [{'error': error_msg}]
                 
-            except Exception as e:
-                error_msg = f"Failed to execute step {step.name}: {str(e)}"
-                logger.error(error_msg)
-                results[step.output_folder] = [{'error': error_msg}]
+                self.update_progress(idx / total_steps * 100)
             
-            self.update_progress(idx / total_steps * 100)
-        
-        execution_time = (datetime.now() - start_time).total_seconds()
+            return self._finish_execution(start_time, results)
+        finally:
+            # Memoized responses only serve repeats within this run
+            self._call_cache = {}
+    
+    def _finish_execution(self, start_time: datetime, results: Dict[str, List[Dict]]) -> Dict[str, Any]:
+        """Record execution metadata alongside the collected step results"""
+        end_time = datetime.now()
+        execution_time = (end_time - start_time).total_seconds()
         self.update_status(f"Playbook execution completed in {execution_time:.2f} seconds")
         
         self.results = {
             'metadata': {
                 'playbook_name': self.current_playbook.config.name,
                 'start_time': start_time.isoformat(),
-                'end_time': datetime.now().isoformat(),
+                'end_time': end_time.isoformat(),
                 'execution_time_seconds': execution_time,
                 'networks': [n['name'] for n in self.connection.selected_networks]
             },
@@ -214,122 +648,200 @@ class PlaybookExecutor:
         
         return self.results
     
-    def _execute_network_call(self, step: ApiCall, base_progress: float) -> List[Dict]:
-        results = []
-        total_networks = len(self.connection.selected_networks)
-        
-        for idx, network in enumerate(self.connection.selected_networks, 1):
-            try:
-                self.update_status(f"Processing network {idx}/{total_networks}: {network['name']}")
-                
-                # Get the appropriate API endpoint
-                api_parts = step.endpoint.split('.')
-                if api_parts[0] == 'networks':
-                    if len(api_parts) == 2 and api_parts[1] == 'devices':
-                        # Direct network endpoint for devices
-                        api_endpoint = getattr(self.connection.dashboard.networks, step.method)
-                    else:
-                        # Network settings endpoints (like getNetworkSwitchSettings)
-                        api_endpoint = getattr(self.connection.dashboard.networks, step.method)
-                else:
-                    raise ValueError(f"Unsupported network endpoint: {step.endpoint}")
-                
-                # Execute the API call
-                params = {**step.parameters, 'networkId': network['id']}
-                logger.info(f"API Call: {step.method} for network {network['name']}")
-                result = api_endpoint(**params)
-                
-                # Cache devices if this is a device list call
-                if step.endpoint == 'networks.devices':
-                    self.devices[network['id']] = [d for d in result if 'serial' in d]
-                
-                results.append({
-                    'network': network['name'],
-                    'networkId': network['id'],
-                    'data': result
-                })
-                
-            except Exception as e:
-                error_msg = f"Error in network {network['name']}: {str(e)}"
-                logger.error(error_msg)
-                results.append({
-                    'network': network['name'],
-                    'networkId': network['id'],
-                    'error': str(e)
-                })
-            
-            # Update progress within this step
-            step_progress = base_progress + (idx / total_networks * (100 / len(self.current_playbook.api_calls)))
-            self.update_progress(step_progress)
+    def _uncached_networks(self) -> List[Dict]:
+        """Selected networks whose devices have not been fetched yet"""
+        return [n for n in self.connection.selected_networks if n['id'] not in self.connection.devices]
+    
+    def _cache_network_devices(self, network: Dict, devices: List[Dict]):
+        """Store a network's devices on the connection"""
+        # Stored whole, like select_networks does; device steps skip serial-less ones on read
+        self.connection.remember_devices(network, devices)
+        logger.info(f"Cached {len(devices)} devices from network {network['name']}")
+    
+    def _resolve_endpoint(self, step: ApiCall, dashboard: Any = None) -> Callable:
+        """Look up the bound SDK method for a playbook step"""
+        dashboard = dashboard or self.connection.dashboard
+        if step.requires_device:
+            return getattr(dashboard.devices, step.method)
         
-        return results
+        if step.is_network:
+            # Both networks.devices and network settings endpoints
+            # (like getNetworkSwitchSettings) live on dashboard.networks
+            return getattr(dashboard.networks, step.method)
+        raise ValueError(f"Unsupported network endpoint: {step.endpoint}")
     
-    def _execute_device_call(self, step: ApiCall, base_progress: float) -> List[Dict]:
-        results = []
-        devices_processed = 0
+    def _execute_network_call(self, compiled: CompiledStep, base_progress: float) -> List[Dict]:
+        networks = self.connection.selected_networks
+        total_networks = len(networks)
         
-        # Get all devices from cache
-        all_devices = []
-        for network in self.connection.selected_networks:
-            network_devices = self.connection.devices.get(network['id'], [])
-            all_devices.extend((network, device) for device in network_devices)
+        return self._run_with_progress(
+            [(self._call_network, compiled, network, idx, total_networks)
+             for idx, network in enumerate(networks)],
+            base_progress
+        )
+    
+    def _call_network(self, compiled: CompiledStep, network: Dict, idx: int, total_networks: int) -> Dict:
+        """Execute a network-level API call for a single network"""
+        step = compiled.step
+        try:
+            # Report status roughly once per percent of the step
+            if idx % max(1, total_networks // 100) == 0:
+                self.update_status(f"Processing network {idx + 1}/{total_networks}: {network['name']}")
+            
+            # Execute the API call
+            logger.debug("API Call: %s for network %s", step.method, network['name'])
+            result = self._memoized_call(compiled.call_key, compiled.bound_callable,
+                                         compiled.param_template, 'networkId', network['id'])
+            return self._network_result(step, network, result)
+            
+        except Exception as e:
+            return self._network_error(network, e)
+    
+    def _network_result(self, step: ApiCall, network: Dict, result: Any) -> Dict:
+        """Flatten a network-level API response into a report row"""
+        # Cache devices if this is a device list call
+        if step.endpoint == 'networks.devices':
+            self.devices[network['id']] = result
         
-        total_devices = len(all_devices)
+        context = {'network': network['name']}
+        self._keep_raw(step, {**context, 'networkId': network['id'], 'data': result})
+        return _flatten_row(context, result)
+    
+    def _network_error(self, network: Dict, error: Exception) -> Dict:
+        """Log a failed network-level call and return its error entry"""
+        error_msg = f"Error in network {network['name']}: {str(error)}"
+        logger.error(error_msg)
+        return {
+            'network': network['name'],
+            'networkId': network['id'],
+            'error': str(error)
+        }
+    
+    def _execute_device_call(self, compiled: CompiledStep, base_progress: float) -> List[Dict]:
+        total_devices = self._device_count()
         if total_devices == 0:
             logger.warning("No devices found for API calls")
-            return results
+            return []
         
-        for network, device in all_devices:
-            try:
+        results = self._run_with_progress(
+            [(self._call_device, compiled, network, device, idx, total_devices)
+             for idx, (network, device) in enumerate(self._device_work_items())],
+            base_progress
+        )
+        
+        # Skipped devices come back as None
+        return [result for result in results if result is not None]
+    
+    @staticmethod
+    def _call_key(step: ApiCall, params: Dict) -> Tuple:
+        """Signature of a step's base call; repr() keeps list-valued filters hashable"""
+        return (step.endpoint, step.method, tuple(sorted((k, repr(v)) for k, v in params.items())))
+    
+    def _memoized_call(self, call_key: Tuple, api_endpoint: Callable, params_base: Dict,
+                       target: str, value: str) -> Any:
+        """Issue an API call for one network or device unless this run already made it"""
+        # The step's parameters were keyed once at compile time; only the target varies
+        if call_key not in self._repeated_call_keys:
+            return self.connection.call(api_endpoint, **{**params_base, target: value})
+        key = (call_key, target, value)
+        if key in self._call_cache:
+            return self._call_cache[key]
+        result = self.connection.call(api_endpoint, **{**params_base, target: value})
+        self._call_cache[key] = result
+        return result
+    
+    def _run_with_progress(self, tasks: List[Tuple], base_progress: float) -> List:
+        """Run (fn, *args) tasks on a small pool, reporting progress as each finishes"""
+        total = len(tasks)
+        results = [None] * total
+        step_share = 100 / len(self.current_playbook.api_calls)
+        
+        # Results are slotted back by index, so they keep the task order
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {pool.submit(*task): idx for idx, task in enumerate(tasks)}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                self.update_progress(base_progress + done / total * step_share)
+        
+        return results
+    
+    def _network_devices(self, network: Dict) -> List[Dict]:
+        """Cached serial-bearing devices of a network, narrowed to device_type when one is set"""
+        # The connection's cache stays whole; the filters are only a view over it.
+        # Lists stored by select_networks and the GUI refresh are unfiltered, so
+        # devices without a serial (which device calls need) are dropped here.
+        device_type = self.device_type
+        return [d for d in self.connection.devices.get(network['id'], ())
+                if 'serial' in d and (device_type is None or d.get('productType', '') == device_type)]
+    
+    def _device_work_items(self) -> Iterator[Tuple[Dict, Dict]]:
+        """Pair every addressable cached device with its network, lazily"""
+        return ((network, device)
+                for network in self.connection.selected_networks
+                for device in self._network_devices(network))
+    
+    def _device_count(self) -> int:
+        """Number of device work items without building them"""
+        return sum(len(self._network_devices(network)) for network in self.connection.selected_networks)
+    
+    def _call_device(self, compiled: CompiledStep, network: Dict, device: Dict,
+                     idx: int, total_devices: int) -> Optional[Dict]:
+        """Execute a device-level API call for a single device"""
+        step = compiled.step
+        try:
+            device_name = device.get('name', device['serial'])
+            
+            # Report status roughly once per percent of the step
+            if idx % max(1, total_devices // 100) == 0:
                 self.update_status(
-                    f"Processing device {devices_processed + 1}/{total_devices}: "
-                    f"{device.get('name', device['serial'])} in network {network['name']}"
+                    f"Processing device {idx + 1}/{total_devices}: "
+                    f"{device_name} in network {network['name']}"
                 )
-                
-                # Get the appropriate API endpoint and method
-                api_endpoint = self.connection.dashboard.devices
-                method = getattr(api_endpoint, step.method)
-                
-                # Execute the API call for each device
-                params = {**step.parameters, 'serial': device['serial']}
-                logger.info(f"API Call: {step.method} for device {device.get('name', device['serial'])}")
-                result = method(**params)
-                
-                # Apply output filter if specified
-                filtered_result = step.filter_response(result)
-                
-                # Add device and network context to the results
-                result_data = {
-                    'network': network['name'],
-                    'networkId': network['id'],
-                    'deviceName': device.get('name', device['serial']),
-                    'deviceSerial': device['serial'],
-                    'deviceModel': device.get('model', ''),
-                    'deviceType': device.get('productType', ''),
-                    'data': filtered_result
-                }
-                
-                results.append(result_data)
-                logger.info(f"Successfully got data for device {device.get('name', device['serial'])}")
-                
-            except Exception as e:
-                # Just log the error and continue
-                error_msg = (f"Skipping device {device.get('name', device['serial'])} "
-                           f"in network {network['name']}: {str(e)}")
-                logger.info(error_msg)  # Changed to info since we expect some devices to fail
             
-            devices_processed += 1
-            # Update progress within this step
-            step_progress = base_progress + (devices_processed / total_devices * 
-                                           (100 / len(self.current_playbook.api_calls)))
-            self.update_progress(step_progress)
+            # Execute the API call for each device
+            logger.debug("API Call: %s for device %s", step.method, device_name)
+            result = self._memoized_call(compiled.call_key, compiled.bound_callable,
+                                         compiled.param_template, 'serial', device['serial'])
+            return self._device_result(step, network, device, result)
+            
+        except Exception as e:
+            self._device_skipped(network, device, e)
+            return None
+    
+    def _device_result(self, step: ApiCall, network: Dict, device: Dict, result: Any) -> Dict:
+        """Flatten a device-level API response into a report row"""
+        # Apply output filter if specified
+        filtered_result = step.filter_response(result)
         
-        return results
+        # Add device and network context to the results
+        context = {
+            'network': network['name'],
+            'deviceName': device.get('name', device['serial']),
+            'deviceSerial': device['serial'],
+            'deviceModel': device.get('model', ''),
+            'deviceType': device.get('productType', '')
+        }
+        self._keep_raw(step, {**context, 'networkId': network['id'], 'data': filtered_result})
+        
+        logger.debug("Successfully got data for device %s", context['deviceName'])
+        return _flatten_row(context, filtered_result)
+    
+    def _keep_raw(self, step: ApiCall, entry: Dict):
+        """Hold on to an unflattened response when raw output was requested"""
+        if self.keep_raw:
+            self.raw_results.setdefault(step.output_folder, []).append(entry)
+    
+    def _device_skipped(self, network: Dict, device: Dict, error: Exception):
+        """Log a device whose call failed; it is left out of the results"""
+        # Just log the error and continue; some devices are expected to fail
+        logger.debug("Skipping device %s in network %s: %s",
+                     device.get('name', device.get('serial')), network['name'], error)
 
 class ReportGenerator:
-    def __init__(self, executor: PlaybookExecutor):
+    def __init__(self, executor: PlaybookExecutor, verbose: bool = False):
         self.executor = executor
         self.metadata = None
+        self.verbose = verbose
     
     def generate_report(self, report_type: str, report_name: str) -> Path:
         if not self.executor.results:
@@ -341,181 +853,103 @@ class ReportGenerator:
             raise ValueError(f"Unsupported report type: {report_type}")
     
     def _generate_csv_report(self, report_name: str) -> Path:
-        import pandas as pd
-        from itertools import chain
+        # One clock reading keeps every stamp in this report consistent
+        now = datetime.now()
+        now_iso = now.isoformat()
+        now_stamp = now.strftime(REPORT_TIMESTAMP_FORMAT)
         
         # Create report directory
-        report_dir = DirectoryManager().create_report_directory(report_name)
+        report_dir = DirectoryManager().create_report_directory(report_name, now_stamp)
         
         # Save metadata
-        with open(report_dir / 'metadata.json', 'w') as f:
-            json.dump(self.executor.results['metadata'], f, indent=2)
+        _dump_json(self.executor.results['metadata'], report_dir / 'metadata.json')
+        
+        # Unflattened responses, for anyone who needs more than the CSV holds
+        if self.executor.raw_results:
+            with open(report_dir / 'raw_results.pkl', 'wb') as f:
+                pickle.dump(self.executor.raw_results, f, protocol=pickle.HIGHEST_PROTOCOL)
         
-        # Create a log file for the execution
-        log_file_path = report_dir / f'execution_log_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
-        with open(log_file_path, 'w') as log_file:
+        # Create a log file for the execution; lines are batched per section
+        # and only echoed to stdout in verbose mode
+        log_file_path = report_dir / f'execution_log_{now_stamp}.txt'
+        with open(log_file_path, 'w', buffering=LOG_BUFFER_SIZE) as log_file:
             # Write metadata
-            log_file.write("=== Execution Metadata ===\n")
-            for key, value in self.executor.results['metadata'].items():
-                log_file.write(f"{key}: {value}\n")
-                print(f"{key}: {value}")
-            log_file.write("\n")
-            print()
+            lines = ["=== Execution Metadata ===\n"]
+            lines.extend(f"{key}: {value}\n" for key, value in self.executor.results['metadata'].items())
+            lines.append("\n")
+            self._flush_log(log_file, lines)
             
-            # Process each result type
-            for folder, data in self.executor.results['results'].items():
-                folder_path = report_dir / folder
-                folder_path.mkdir(exist_ok=True)
-                
-                log_file.write(f"\n=== {folder} Results ===\n")
-                print(f"\n=== {folder} Results ===")
-                
-                flattened_data = []
-                for result in data:
-                    if 'error' in result:
-                        error_msg = f"Error in network {result['network']}: {result['error']}"
-                        log_file.write(f"{error_msg}\n")
-                        print(error_msg)
-                        continue
-                    
-                    # Start with the common device info
-                    flat_result = {
-                        'network': result['network'],
-                        'deviceName': result.get('deviceName', ''),
-                        'deviceSerial': result.get('deviceSerial', ''),
-                        'deviceModel': result.get('deviceModel', ''),
-                        'deviceType': result.get('deviceType', '')
-                    }
-                    
-                    # Log device info
-                    device_info = f"\nDevice: {flat_result['deviceName']} ({flat_result['deviceSerial']})"
-                    device_info += f"\nNetwork: {flat_result['network']}"
-                    device_info += f"\nModel: {flat_result['deviceModel']}"
-                    device_info += f"\nType: {flat_result['deviceType']}"
-                    log_file.write(f"{device_info}\n")
-                    print(device_info)
-                    
-                    # Flatten and log the API response data
-                    if isinstance(result['data'], dict):
-                        log_file.write("Settings:\n")
-                        print("Settings:")
-                        for key, value in result['data'].items():
-                            flat_result[key] = value
-                            log_file.write(f"  {key}: {value}\n")
-                            print(f"  {key}: {value}")
-                    elif isinstance(result['data'], list):
-                        if result['data'] and isinstance(result['data'][0], dict):
-                            log_file.write("Settings:\n")
-                            print("Settings:")
-                            for key, value in result['data'][0].items():
-                                flat_result[key] = value
-                                log_file.write(f"  {key}: {value}\n")
-                                print(f"  {key}: {value}")
-                    
-                    log_file.write("-" * 50 + "\n")
-                    print("-" * 50)
-                    flattened_data.append(flat_result)
-                
-                if flattened_data:
-                    # Convert to DataFrame - this will automatically align all columns
-                    df = pd.DataFrame(flattened_data)
-                    
-                    # Add timestamp
-                    df['timestamp'] = datetime.now().isoformat()
-                    
-                    # Save to CSV
-                    csv_path = folder_path / f'{folder}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-                    df.to_csv(csv_path, index=False)
-                    
-                    # Generate a schema file to document the columns
-                    schema = {col: str(df[col].dtype) for col in df.columns}
-                    with open(folder_path / 'schema.json', 'w') as f:
-                        json.dump(schema, f, indent=2)
-                    
-                    log_file.write(f"\nGenerated CSV with columns: {list(df.columns)}\n")
-                    print(f"\nGenerated CSV with columns: {list(df.columns)}")
+            # Folders are independent, so write them concurrently; their log
+            # sections are flushed afterwards in result order
+            folders = self.executor.results['results']
+            if folders:
+                workers = min(len(folders), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    sections = [pool.submit(self._write_folder, report_dir, folder, data, now_iso, now_stamp)
+                                for folder, data in folders.items()]
+                    for section in sections:
+                        self._flush_log(log_file, section.result())
         
-        return report_dir 
-
-class PlaybookConfig:
-    def __init__(self, name: str, description: str, version: str, author: str):
-        self.name = name
-        self.description = description
-        self.version = version
-        self.author = author
-
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'PlaybookConfig':
-        return cls(
-            name=data.get('name', ''),
-            description=data.get('description', ''),
-            version=data.get('version', ''),
-            author=data.get('author', '')
-        )
-
-class ApiCall:
-    def __init__(self, name: str, endpoint: str, method: str, output_folder: str, 
-                 parameters: Dict = None, filters: Dict = None, output_filter: List[str] = None,
-                 requires_device: bool = False):
-        self.name = name
-        self.endpoint = endpoint
-        self.method = method
-        self.output_folder = output_folder
-        self.parameters = parameters or {}
-        self.filters = filters or {}
-        self.output_filter = output_filter or []
-        self.requires_device = requires_device or endpoint.startswith('devices.')
-
-    def filter_response(self, response: Any) -> Dict:
-        """Filter the API response based on output_filter if specified."""
-        if not self.output_filter or not isinstance(response, dict):
-            return response
-            
-        filtered_data = {}
-        for field in self.output_filter:
-            # Handle nested fields with dot notation (e.g., 'staticDns.ip')
-            parts = field.split('.')
-            value = response
-            for part in parts:
-                if isinstance(value, dict):
-                    value = value.get(part)
+        return report_dir
+    
+    def _write_folder(self, report_dir: Path, folder: str, data: List[Dict],
+                      now_iso: str, now_stamp: str) -> List[str]:
+        """Write one output folder's CSV and schema, returning its log lines"""
+        folder_path = report_dir / folder
+        folder_path.mkdir(exist_ok=True)
+        
+        lines = [f"\n=== {folder} Results ===\n"]
+        
+        # Rows arrive already flattened; only error entries need separating
+        flattened_data = []
+        for row in data:
+            if 'error' in row and 'deviceSerial' not in row:
+                if 'network' in row:
+                    error_msg = f"Error in network {row['network']}: {row['error']}"
                 else:
-                    value = None
-                    break
-            filtered_data[field] = value
-        return filtered_data
-
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'ApiCall':
-        api_data = data.get('api', {})
-        return cls(
-            name=data.get('name', ''),
-            endpoint=api_data.get('endpoint', ''),
-            method=api_data.get('method', ''),
-            output_folder=data.get('output', ''),
-            parameters=api_data.get('parameters', {}),
-            filters=api_data.get('filters', {}),
-            output_filter=api_data.get('output_filter', []),
-            requires_device=api_data.get('requires_device', False)
-        ) 
-
-class Playbook:
-    def __init__(self, config: PlaybookConfig, api_calls: List[ApiCall]):
-        self.config = config
-        self.api_calls = api_calls
-
-    @classmethod
-    def from_yaml(cls, yaml_path: Path) -> 'Playbook':
-        """Load a playbook from a YAML file."""
-        try:
-            with open(yaml_path, 'r') as f:
-                data = yaml.safe_load(f)
+                    # Step-level failure, e.g. an unsupported endpoint
+                    error_msg = row['error']
+                lines.append(f"{error_msg}\n")
+                continue
             
-            config = PlaybookConfig.from_dict(data.get('config', {}))
-            api_calls = [ApiCall.from_dict(call) for call in data.get('api_calls', [])]
+            # Log device info
+            lines.append(f"\nDevice: {row['deviceName']} ({row['deviceSerial']})"
+                         f"\nNetwork: {row['network']}"
+                         f"\nModel: {row['deviceModel']}"
+                         f"\nType: {row['deviceType']}\n")
             
-            return cls(config=config, api_calls=api_calls)
+            # Log the API response data
+            settings = [(key, value) for key, value in row.items() if key not in ROW_CONTEXT]
+            if settings:
+                lines.append("Settings:\n")
+                lines.extend(f"  {key}: {value}\n" for key, value in settings)
             
-        except Exception as e:
-            logger.error(f"Failed to load playbook {yaml_path}: {e}")
-            raise ValueError(f"Invalid playbook format: {e}") 
\ No newline at end of file
+            lines.append("-" * 50 + "\n")
+            flattened_data.append(row)
+        
+        if flattened_data:
+            # Union of all row keys, in first-seen order, so every column lines up
+            columns, schema = _collect_schema(flattened_data)
+            constants = {'timestamp': now_iso}
+            # The run timestamp overrides any 'timestamp' field in the responses
+            columns = [col for col in columns if col not in constants] + list(constants)
+            schema.pop('timestamp', None)
+            schema['timestamp'] = 'object'
+            
+            # Save to CSV
+            csv_path = folder_path / f'{folder}_{now_stamp}.csv'
+            _write_csv(csv_path, columns, flattened_data, constants=constants)
+            
+            # Generate a schema file to document the columns
+            _dump_json(schema, folder_path / 'schema.json')
+            
+            lines.append(f"\nGenerated CSV with columns: {columns}\n")
+        
+        return lines
+    
+    def _flush_log(self, log_file, lines: List[str]):
+        """Write a batch of log lines, echoing them to stdout in verbose mode"""
+        log_file.writelines(lines)
+        # pythonw and other GUI launches run with no stdout at all
+        if self.verbose and sys.stdout is not None:
+            sys.stdout.writelines(lines)
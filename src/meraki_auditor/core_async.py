@@ -0,0 +1,231 @@
+"""asyncio-based playbook execution on top of the Meraki SDK's aiohttp client."""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import meraki.aio
+
+from .core import (MerakiConnection, PlaybookExecutor, MAX_WORKERS, MAX_RETRIES,
+                   NETWORKS_PER_PAGE, DEVICES_PER_PAGE, _backoff_delay)
+from .playbook import ApiCall
+
+logger = logging.getLogger(__name__)
+
+async def _acall_with_backoff(fn: Callable, slots: Optional[asyncio.Semaphore] = None,
+                              **kwargs) -> Any:
+    """Await an SDK coroutine, backing off exponentially on 429 responses"""
+    for attempt in range(MAX_RETRIES):
+        try:
+            # Hold a request slot only while the call is in flight, not while backing off
+            if slots is None:
+                return await fn(**kwargs)
+            async with slots:
+                return await fn(**kwargs)
+        except meraki.AsyncAPIError as e:
+            if e.status != 429 or attempt == MAX_RETRIES - 1:
+                raise
+            delay = _backoff_delay(e, attempt)
+            logger.warning(f"Rate limited, retrying in {delay:.1f} seconds")
+            await asyncio.sleep(delay)
+
+class AsyncMerakiConnection(MerakiConnection):
+    """MerakiConnection that enumerates organization networks from one event loop"""
+    
+    @staticmethod
+    def _api_errors() -> Tuple[type, ...]:
+        return (meraki.APIError, meraki.AsyncAPIError)
+    
+    def _fetch_all_org_networks(self, orgs: List[Dict]) -> List[List[Dict]]:
+        return asyncio.run(self._fetch_all_org_networks_async(orgs))
+    
+    async def _fetch_all_org_networks_async(self, orgs: List[Dict]) -> List[List[Dict]]:
+        org_networks = [None] * len(orgs)
+        
+        async with meraki.aio.AsyncDashboardAPI(
+            self.api_key,
+            output_log=False,
+            print_console=False,
+            maximum_concurrent_requests=MAX_WORKERS,
+            maximum_retries=MAX_RETRIES,
+            wait_on_rate_limit=True,
+        ) as dashboard:
+            async def fetch(idx: int, org: Dict):
+                logger.info(f"API Call: getOrganizationNetworks for org {org['name']}")
+                return idx, await dashboard.organizations.getOrganizationNetworks(
+                    org['id'], total_pages='all', perPage=NETWORKS_PER_PAGE
+                )
+            
+            for done, future in enumerate(asyncio.as_completed(
+                    [fetch(idx, org) for idx, org in enumerate(orgs)]), 1):
+                idx, networks = await future
+                org_networks[idx] = networks
+                self._org_loaded(orgs[idx], done, len(orgs))
+        
+        return org_networks
+
+class AsyncPlaybookExecutor(PlaybookExecutor):
+    """Drop-in PlaybookExecutor that drives every call from one event loop.
+    
+    Calls for a step are issued as coroutines and gathered, with an
+    ``asyncio.Semaphore`` keeping in-flight requests within the Meraki
+    per-organization concurrency limit.
+    """
+    
+    def execute(self) -> Dict[str, Any]:
+        return asyncio.run(self.execute_async())
+    
+    async def execute_async(self) -> Dict[str, Any]:
+        if not self.current_playbook:
+            raise ValueError("No playbook loaded")
+        
+        try:
+            start_time = datetime.now()
+            results = {}
+            self.raw_results = {}
+            total_steps = len(self.current_playbook.api_calls)
+            # Compiling the playbook finds the call keys worth memoizing
+            self._steps()
+            
+            self.update_status(f"Starting execution of playbook: {self.current_playbook.config.name}")
+            self.update_progress(0)
+            
+            async with meraki.aio.AsyncDashboardAPI(
+                self.connection.api_key,
+                output_log=False,
+                print_console=False,
+                maximum_concurrent_requests=MAX_WORKERS,
+                maximum_retries=MAX_RETRIES,
+                # _acall_with_backoff retries 429s, so the SDK raises them instead of retrying too
+                wait_on_rate_limit=False,
+            ) as dashboard:
+                semaphore = asyncio.Semaphore(MAX_WORKERS)
+                
+                # First, ensure we have devices cached if we need them
+                if any(step.requires_device for step in self.current_playbook.api_calls):
+                    self.update_status("Caching devices from networks...")
+                    await self._cache_devices_async(dashboard, semaphore)
+                
+                for idx, step in enumerate(self.current_playbook.api_calls, 1):
+                    step_progress_base = (idx - 1) / total_steps * 100
+                    
+                    self.update_status(f"Executing step {idx}/{total_steps}: {step.name}")
+                    
+                    try:
+                        api_endpoint = self._resolve_endpoint(step, dashboard)
+                        
+                        if step.requires_device:
+                            results[step.output_folder] = await self._gather_device_calls(
+                                step, api_endpoint, semaphore, step_progress_base)
+                        else:
+                            results[step.output_folder] = await self._gather_network_calls(
+                                step, api_endpoint, semaphore, step_progress_base)
+                        
+                    except Exception as e:
+                        error_msg = f"Failed to execute step {step.name}: {str(e)}"
+                        logger.error(error_msg)
+                        results[step.output_folder] = [{'error': error_msg}]
+                    
+                    self.update_progress(idx / total_steps * 100)
+            
+            return self._finish_execution(start_time, results)
+        finally:
+            # Memoized responses only serve repeats within this run
+            self._call_cache = {}
+    
+    async def _cache_devices_async(self, dashboard: Any, semaphore: asyncio.Semaphore):
+        batches = list(self.connection._device_batches(self._uncached_networks()))
+        
+        async def fetch(org_id: Optional[str], batch: List[Dict]) -> Dict[str, List[Dict]]:
+            if not org_id:
+                network = batch[0]
+                return {network['id']: await _acall_with_backoff(
+                    dashboard.networks.getNetworkDevices, slots=semaphore, networkId=network['id'])}
+            
+            # One organization-wide listing, filtered to the batch, replaces a call per network
+            logger.info(f"API Call: getOrganizationDevices for {len(batch)} networks in org {org_id}")
+            devices = await _acall_with_backoff(
+                dashboard.organizations.getOrganizationDevices, slots=semaphore,
+                organizationId=org_id, total_pages='all', perPage=DEVICES_PER_PAGE,
+                networkIds=[n['id'] for n in batch])
+            return self.connection._devices_by_network(devices)
+        
+        responses = await asyncio.gather(*(fetch(org_id, batch) for org_id, batch in batches),
+                                         return_exceptions=True)
+        for (_, batch), by_network in zip(batches, responses):
+            for network in batch:
+                if isinstance(by_network, Exception):
+                    logger.error(f"Failed to cache devices for network {network['name']}: {by_network}")
+                else:
+                    self._cache_network_devices(network, by_network.get(network['id'], []))
+    
+    async def _gather_network_calls(self, step: ApiCall, api_endpoint: Callable,
+                                    semaphore: asyncio.Semaphore, base_progress: float) -> List[Dict]:
+        networks = self.connection.selected_networks
+        params_base = dict(step.parameters)
+        call_key = self._call_key(step, params_base)
+        
+        async def call(network: Dict) -> Dict:
+            try:
+                logger.debug("API Call: %s for network %s", step.method, network['name'])
+                result = await self._memoized_call_async(call_key, api_endpoint, semaphore, params_base,
+                                                         'networkId', network['id'])
+                return self._network_result(step, network, result)
+            except Exception as e:
+                return self._network_error(network, e)
+        
+        return await self._gather_with_progress([call(n) for n in networks], base_progress)
+    
+    async def _gather_device_calls(self, step: ApiCall, api_endpoint: Callable,
+                                   semaphore: asyncio.Semaphore, base_progress: float) -> List[Dict]:
+        if not self._device_count():
+            logger.warning("No devices found for API calls")
+            return []
+        params_base = dict(step.parameters)
+        call_key = self._call_key(step, params_base)
+        
+        async def call(network: Dict, device: Dict) -> Optional[Dict]:
+            try:
+                logger.debug("API Call: %s for device %s", step.method, device.get('name', device['serial']))
+                result = await self._memoized_call_async(call_key, api_endpoint, semaphore, params_base,
+                                                         'serial', device['serial'])
+                return self._device_result(step, network, device, result)
+            except Exception as e:
+                self._device_skipped(network, device, e)
+                return None
+        
+        results = await self._gather_with_progress(
+            [call(network, device) for network, device in self._device_work_items()], base_progress)
+        
+        # Skipped devices come back as None
+        return [result for result in results if result is not None]
+    
+    async def _memoized_call_async(self, call_key: Tuple, api_endpoint: Callable,
+                                   semaphore: asyncio.Semaphore, params_base: Dict,
+                                   target: str, value: str) -> Any:
+        """Await an API call for one network or device unless this run already made it"""
+        if call_key not in self._repeated_call_keys:
+            return await _acall_with_backoff(api_endpoint, slots=semaphore, **{**params_base, target: value})
+        key = (call_key, target, value)
+        if key in self._call_cache:
+            return self._call_cache[key]
+        result = await _acall_with_backoff(api_endpoint, slots=semaphore, **{**params_base, target: value})
+        self._call_cache[key] = result
+        return result
+    
+    async def _gather_with_progress(self, coros: List, base_progress: float) -> List:
+        """Await coroutines concurrently, reporting progress as each finishes"""
+        total = len(coros)
+        results = [None] * total
+        step_share = 100 / len(self.current_playbook.api_calls)
+        
+        async def indexed(idx: int, coro):
+            return idx, await coro
+        
+        for done, future in enumerate(asyncio.as_completed(
+                [indexed(idx, coro) for idx, coro in enumerate(coros)]), 1):
+            idx, result = await future
+            results[idx] = result
+            self.update_progress(base_progress + done / total * step_share)
+        
+        return results
@@ -1,16 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from .core import MerakiConnection, PlaybookExecutor, ReportGenerator
 from .playbook import Playbook
-from .utils import DirectoryManager
-from datetime import datetime
+from .utils import DirectoryManager, REPORT_TIMESTAMP_FORMAT
+import csv
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class AuditorGUI:
-    def __init__(self):
+    def __init__(self, use_async: bool = False, use_cache: bool = True, keep_raw: bool = False,
+                 cache_ttl: Optional[float] = None, verbose: bool = False):
         self.root = tk.Tk()
         self.root.title("Meraki Network Auditor")
         
@@ -24,6 +28,16 @@ class AuditorGUI:
         self.report_generator: Optional[ReportGenerator] = None
         self.networks: List[Dict] = []
         self.selected_networks: List[str] = []
+        self.use_async = use_async
+        self.use_cache = use_cache
+        self.cache_ttl = cache_ttl
+        self.keep_raw = keep_raw
+        self.verbose = verbose
+        # Slow Dashboard work runs here; only the Tk thread touches widgets
+        self.background = ThreadPoolExecutor(max_workers=1)
+        self.dir_manager = DirectoryManager()
+        # Parsed playbooks keyed by path, reused while the file's mtime is unchanged
+        self._playbook_cache: Dict[Path, Tuple[float, Playbook]] = {}
         
     def prompt_api_key(self) -> Optional[str]:
         """Prompt user for Meraki API key"""
@@ -128,7 +142,12 @@ class AuditorGUI:
             self.root.quit()
             return False
         
-        self.connection = MerakiConnection(api_key)
+        connection_class = MerakiConnection
+        if self.use_async:
+            # Only pull in the aiohttp client when it is asked for
+            from .core_async import AsyncMerakiConnection as connection_class
+        self.connection = connection_class(api_key, use_cache=self.use_cache,
+                                           cache_ttl=self.cache_ttl)
         
         # Set up callbacks for connection
         self.connection.set_callbacks(
@@ -152,8 +171,12 @@ class AuditorGUI:
                 return False
             
             self.connection.select_networks(selected_networks)
-            self.executor = PlaybookExecutor(self.connection)
-            self.report_generator = ReportGenerator(self.executor)
+            if self.use_async:
+                from .core_async import AsyncPlaybookExecutor
+                self.executor = AsyncPlaybookExecutor(self.connection, keep_raw=self.keep_raw)
+            else:
+                self.executor = PlaybookExecutor(self.connection, keep_raw=self.keep_raw)
+            self.report_generator = ReportGenerator(self.executor, verbose=self.verbose)
             return True
             
         except Exception as e:
@@ -167,6 +190,31 @@ class AuditorGUI:
         
         self.setup_ui()
         self.root.mainloop()
+        self.background.shutdown(wait=False)
+    
+    def on_ui(self, fn, *args):
+        """Queue a widget update from the background worker onto the Tk thread"""
+        self.root.after(0, fn, *args)
+    
+    def get_playbook(self, playbook_path: Path) -> Playbook:
+        """Load a playbook, reusing the parsed copy if the file hasn't changed"""
+        mtime = playbook_path.stat().st_mtime
+        cached = self._playbook_cache.get(playbook_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        playbook = Playbook(playbook_path)
+        playbook.load()
+        self._playbook_cache[playbook_path] = (mtime, playbook)
+        return playbook
+    
+    def prefetch_playbooks(self, playbook_paths: List[Path]):
+        """Parse and validate playbooks ahead of the first preview or run"""
+        for playbook_path in playbook_paths:
+            try:
+                self.get_playbook(playbook_path).validate()
+            except Exception as e:
+                # The preview or run reports the error if the playbook is picked
+                logger.debug("Could not prefetch playbook %s: %s", playbook_path, e)
     
     def setup_ui(self):
         """Setup the main UI after successful initialization"""
@@ -208,101 +256,170 @@ class AuditorGUI:
         network_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         network_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
-        def refresh_network_tree():
-            """Refresh the network tree view and cache devices"""
-            # Clear existing items
+        # Devices come from the connection's cache; errors from the last refresh are kept here
+        load_errors: Dict[str, str] = {}
+        
+        def device_types() -> List[str]:
+            """Distinct product types across the selected networks' cached devices"""
+            devices = self.connection.devices
+            return ["all"] + sorted({d.get('productType', '')
+                                     for network in self.connection.selected_networks
+                                     for d in devices.get(network['id'], ())})
+        
+        # Tree node id -> network id; device rows are only inserted when a node is opened
+        tree_networks: Dict[str, str] = {}
+        # Network node id -> its device rows as (row id, productType), in insertion order
+        device_rows: Dict[str, List[Tuple[str, str]]] = {}
+        
+        def populate_network_tree():
+            """Rebuild the network tree view with one collapsed node per network"""
+            # Clear existing items, including device rows the filter has detached
             for item in network_tree.get_children():
                 network_tree.delete(item)
+            hidden_rows = [row for rows in device_rows.values() for row, _ in rows
+                           if network_tree.exists(row)]
+            if hidden_rows:
+                network_tree.delete(*hidden_rows)
+            tree_networks.clear()
+            device_rows.clear()
             
-            # Clear existing device cache
-            self.connection.devices = {}
-            
-            # Repopulate and cache devices
             for network in self.connection.selected_networks:
-                network_node = network_tree.insert("", tk.END, text=network['name'], open=True)
-                try:
-                    devices = self.connection.dashboard.networks.getNetworkDevices(networkId=network['id'])
-                    # Cache devices for this network
-                    self.connection.devices[network['id']] = devices
+                network_node = network_tree.insert("", tk.END, text=network['name'])
+                tree_networks[network_node] = network['id']
+                if network['id'] in load_errors:
+                    network_tree.insert(network_node, tk.END, text=load_errors[network['id']])
+                elif not self.connection.devices.get(network['id']):
+                    network_tree.insert(network_node, tk.END, text="No devices found")
+                else:
+                    network_tree.insert(network_node, tk.END, text="Loading...", tags=('placeholder',))
+        
+        def insert_device_rows(network_node: str):
+            """Swap a network node's placeholder for its cached device rows"""
+            children = network_tree.get_children(network_node)
+            if not children or 'placeholder' not in network_tree.item(children[0], 'tags'):
+                return
+            network_tree.delete(children[0])
+            
+            # Fill the node while it is detached so the tree lays out once, not per row
+            position = network_tree.index(network_node)
+            network_tree.detach(network_node)
+            rows = device_rows[network_node] = []
+            for device in self.connection.devices.get(tree_networks[network_node], []):
+                device_values = (
+                    device.get('productType', 'Unknown'),
+                    device.get('model', 'Unknown'),
+                    device.get('serial', 'Unknown')
+                )
+                device_name = device.get('name', 'Unnamed')
+                if device_name == 'Unnamed':
+                    device_name = f"{device.get('model', 'Unknown')} - {device.get('serial', 'Unknown')}"
                     
-                    if not devices:
-                        network_tree.insert(network_node, tk.END, text="No devices found")
-                        continue
-                        
-                    for device in devices:
-                        device_values = (
-                            device.get('productType', 'Unknown'),
-                            device.get('model', 'Unknown'),
-                            device.get('serial', 'Unknown')
-                        )
-                        device_name = device.get('name', 'Unnamed')
-                        if device_name == 'Unnamed':
-                            device_name = f"{device.get('model', 'Unknown')} - {device.get('serial', 'Unknown')}"
-                            
-                        network_tree.insert(network_node, tk.END, 
-                                          text=device_name,
-                                          values=device_values,
-                                          tags=(device.get('productType', '').lower(),))
-                        
-                except Exception as e:
-                    error_msg = f"Error loading devices: {str(e)}"
+                row = network_tree.insert(network_node, tk.END, 
+                                        text=device_name,
+                                        values=device_values,
+                                        tags=(device.get('productType', '').lower(),))
+                rows.append((row, device.get('productType', '')))
+            network_tree.reattach(network_node, '', position)
+            network_tree.item(network_node, open=True)
+            apply_device_filter()
+        
+        def on_network_open(event):
+            """Load device rows the first time a network node is expanded"""
+            network_node = network_tree.focus()
+            if network_node in tree_networks:
+                insert_device_rows(network_node)
+        
+        network_tree.bind('<<TreeviewOpen>>', on_network_open)
+        
+        def refresh_network_tree():
+            """Re-fetch devices in the background and refresh the tree view when they arrive"""
+            refresh_devices_btn.configure(state='disabled')
+            self.status_var.set("Refreshing devices...")
+            self.background.submit(fetch_selected_devices)
+        
+        def fetch_selected_devices():
+            """Fetch devices off the Tk thread; fetch_devices already overlaps the requests"""
+            try:
+                results = list(self.connection.fetch_devices(self.connection.selected_networks))
+            except Exception as e:
+                logger.error(f"Failed to refresh devices: {e}")
+                results = [(network, e) for network in self.connection.selected_networks]
+            self.root.after(0, lambda: apply_refreshed_devices(results))
+        
+        def apply_refreshed_devices(results: List[Tuple[Dict, Any]]):
+            """Store refreshed devices and redraw the tree on the Tk thread"""
+            load_errors.clear()
+            for network, devices in results:
+                if isinstance(devices, Exception):
+                    error_msg = f"Error loading devices: {str(devices)}"
                     logger.error(error_msg)
-                    network_tree.insert(network_node, tk.END, text=error_msg)
+                    load_errors[network['id']] = error_msg
+                    self.connection.devices.pop(network['id'], None)
+                else:
+                    self.connection.remember_devices(network, devices)
+            
+            populate_network_tree()
+            type_combo.configure(values=device_types())
+            refresh_devices_btn.configure(state='normal')
+            self.status_var.set("Ready")
         
         def export_device_inventory():
-            """Export all devices from selected networks to CSV"""
+            """Export all devices from selected networks to CSV in the background"""
+            self.status_var.set("Exporting device inventory...")
+            export_btn.configure(state='disabled')
+            
+            # Copy the cached device dicts so the extra columns don't leak back into the cache
+            all_devices = [
+                {**device, 'networkName': network['name'], 'networkId': network['id']}
+                for network in self.connection.selected_networks
+                for device in self.connection.devices.get(network['id'], [])
+            ]
+            self.background.submit(write_device_inventory, all_devices)
+        
+        def write_device_inventory(all_devices: List[Dict]):
+            """Write the inventory CSV off the Tk thread"""
             try:
-                self.status_var.set("Exporting device inventory...")
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                dir_manager = DirectoryManager()
-                report_path = dir_manager.create_report_directory("device_inventory")
+                timestamp = time.strftime(REPORT_TIMESTAMP_FORMAT)
                 
-                all_devices = []
-                for network in self.connection.selected_networks:
-                    try:
-                        devices = self.connection.dashboard.networks.getNetworkDevices(networkId=network['id'])
-                        for device in devices:
-                            device['networkName'] = network['name']
-                            device['networkId'] = network['id']
-                            all_devices.append(device)
-                    except Exception as e:
-                        messagebox.showerror("Error", 
-                                           f"Failed to get devices for network {network['name']}: {str(e)}")
+                report_path = self.dir_manager.create_report_directory("device_inventory", timestamp)
                 
                 if all_devices:
-                    import pandas as pd
-                    df = pd.DataFrame(all_devices)
-                    
-                    # Reorder columns to put important info first
+                    # Every key seen, in first-seen order, with important info first
                     important_cols = ['networkName', 'name', 'model', 'serial', 'productType', 
                                     'networkId', 'mac', 'lanIp', 'firmware', 'status']
-                    cols = [col for col in important_cols if col in df.columns] + \
-                          [col for col in df.columns if col not in important_cols]
-                    df = df[cols]
+                    order = {col: i for i, col in enumerate(important_cols)}
+                    seen = dict.fromkeys(key for device in all_devices for key in device)
+                    # Stable sort: important columns by rank, the rest keep first-seen order
+                    cols = sorted(seen, key=lambda col: order.get(col, len(order)))
                     
                     csv_path = report_path / f'device_inventory_{timestamp}.csv'
-                    df.to_csv(csv_path, index=False)
+                    with open(csv_path, 'w', newline='') as f:
+                        writer = csv.DictWriter(f, fieldnames=cols, lineterminator='\n')
+                        writer.writeheader()
+                        writer.writerows(all_devices)
                     
-                    self.status_var.set("Device inventory exported successfully!")
-                    messagebox.showinfo("Success", f"Device inventory exported to:\n{csv_path}")
+                    self.on_ui(self.status_var.set, "Device inventory exported successfully!")
+                    # Leave the success message up for a moment before going back to Ready
+                    self.on_ui(self.root.after, 3000, self.status_var.set, "Ready")
+                    self.on_ui(messagebox.showinfo, "Success", f"Device inventory exported to:\n{csv_path}")
                 else:
-                    messagebox.showwarning("Warning", "No devices found in selected networks")
+                    self.on_ui(self.status_var.set, "Ready")
+                    self.on_ui(messagebox.showwarning, "Warning", "No devices found in selected networks")
                     
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to export device inventory: {str(e)}")
-                self.status_var.set("Export failed")
+                self.on_ui(messagebox.showerror, "Error", f"Failed to export device inventory: {str(e)}")
+                self.on_ui(self.status_var.set, "Export failed")
             finally:
-                self.status_var.set("Ready")
+                self.on_ui(export_btn.configure, {'state': 'normal'})
         
         # Add button frame below tree
         network_button_frame = ttk.Frame(network_panel)
         network_button_frame.pack(fill=tk.X, pady=5)
 
         # Add refresh button to network panel
-        refresh_btn = ttk.Button(network_button_frame, text="Refresh Devices", 
-                               command=refresh_network_tree)
-        refresh_btn.pack(side=tk.LEFT, padx=5)
+        refresh_devices_btn = ttk.Button(network_button_frame, text="Refresh Devices", 
+                                       command=refresh_network_tree)
+        refresh_devices_btn.pack(side=tk.LEFT, padx=5)
 
         # Add export button
         export_btn = ttk.Button(network_button_frame, text="Export Device Inventory", 
@@ -332,24 +449,20 @@ class AuditorGUI:
         type_frame.pack(fill=tk.X, pady=2)
         ttk.Label(type_frame, text="Device Type:").pack(side=tk.LEFT)
         type_var = tk.StringVar(value="all")
-        type_combo = ttk.Combobox(type_frame, textvariable=type_var, 
-                                 values=["all"] + list(set(d.get('productType', '') 
-                                                         for n in self.connection.selected_networks 
-                                                         for d in self.connection.dashboard.networks.getNetworkDevices(networkId=n['id']))))
+        # Computed from the cache before the widget is built; no API calls during layout
+        product_types = device_types()
+        type_combo = ttk.Combobox(type_frame, textvariable=type_var, values=product_types)
         type_combo.pack(side=tk.LEFT, padx=5)
         
         def apply_device_filter(*args):
             """Filter devices in tree based on selected type"""
+            # Treeview tags can't hide rows; set_children detaches the rest and keeps them for later
             filter_type = type_var.get()
-            for network_id in network_tree.get_children():
-                for device_id in network_tree.get_children(network_id):
-                    device_type = network_tree.item(device_id)['values'][0]
-                    if filter_type == "all" or device_type == filter_type:
-                        network_tree.item(device_id, tags=())  # Show
-                    else:
-                        network_tree.item(device_id, tags=('hidden',))  # Hide
-            
-            network_tree.tag_configure('hidden', hide=True)
+            for network_node, rows in device_rows.items():
+                network_tree.set_children(network_node, *[
+                    row for row, device_type in rows
+                    if filter_type == "all" or device_type == filter_type
+                ])
         
         type_combo.bind('<<ComboboxSelected>>', apply_device_filter)
         
@@ -387,14 +500,25 @@ class AuditorGUI:
         button_frame.pack(fill=tk.X, pady=5)
         
         # Load available playbooks
-        dir_manager = DirectoryManager()
-        playbooks = dir_manager.get_playbooks()
+        playbooks = self.dir_manager.get_playbooks()
         
-        for playbook_name in playbooks.keys():
-            playbook_list.insert(tk.END, playbook_name)
+        playbook_list.insert(tk.END, *playbooks.keys())
+        self.background.submit(self.prefetch_playbooks, list(playbooks.values()))
+        
+        # Pending preview redraw; rapid selection changes collapse into one
+        preview_after_id: Optional[str] = None
+        
+        def schedule_preview(*args):
+            """Redraw the preview once the selection has settled"""
+            nonlocal preview_after_id
+            if preview_after_id:
+                self.root.after_cancel(preview_after_id)
+            preview_after_id = self.root.after(150, update_preview)
         
         def update_preview(*args):
             """Update preview when a playbook is selected"""
+            nonlocal preview_after_id
+            preview_after_id = None
             selection = playbook_list.curselection()
             if not selection:
                 return
@@ -403,8 +527,7 @@ class AuditorGUI:
             playbook_path = playbooks[playbook_name]
             
             try:
-                playbook = Playbook(playbook_path)
-                playbook.load()
+                playbook = self.get_playbook(playbook_path)
                 
                 preview_text.configure(state='normal')
                 preview_text.delete(1.0, tk.END)
@@ -440,64 +563,75 @@ class AuditorGUI:
             playbook_name = playbook_list.get(selection[0])
             playbook_path = playbooks[playbook_name]
             
-            # Get filtered devices
+            # Device steps filter the cached devices in memory; the cache itself is untouched
             filtered_type = type_var.get()
-            if filtered_type != "all":
-                # Create filtered device cache using existing cached devices
-                filtered_devices = {}
-                for network_id, devices in self.connection.devices.items():
-                    filtered_devices[network_id] = [
-                        d for d in devices if d.get('productType', '') == filtered_type
-                    ]
-                self.executor.devices = filtered_devices
-            else:
-                # Use all cached devices
-                self.executor.devices = self.connection.devices
+            self.executor.device_type = None if filtered_type == "all" else filtered_type
             
+            self.status_var.set("Loading playbook...")
+            self.progress_var.set(0)
+            execute_btn.configure(state='disabled')
+            self.background.submit(run_playbook, playbook_name, playbook_path)
+        
+        def run_playbook(playbook_name: str, playbook_path):
+            """Execute the playbook and write its report off the Tk thread"""
             try:
-                self.status_var.set("Loading playbook...")
-                self.progress_var.set(0)
-                
-                self.executor.load_playbook(playbook_path)
+                self.executor.use_playbook(self.get_playbook(playbook_path))
                 
-                # Set up callbacks
+                # Set up callbacks; they fire on worker threads
                 self.executor.set_callbacks(
-                    progress_callback=lambda p: self.progress_var.set(p),
-                    status_callback=lambda s: self.status_var.set(s)
+                    progress_callback=lambda p: self.on_ui(self.progress_var.set, p),
+                    status_callback=lambda s: self.on_ui(self.status_var.set, s)
                 )
                 
                 results = self.executor.execute()
                 
-                self.status_var.set("Generating report...")
-                self.progress_var.set(90)
+                self.on_ui(self.status_var.set, "Generating report...")
+                self.on_ui(self.progress_var.set, 90)
                 
                 report_path = self.report_generator.generate_report('csv', playbook_name)
                 
-                self.status_var.set("Complete!")
-                self.progress_var.set(100)
+                self.on_ui(self.status_var.set, "Complete!")
+                self.on_ui(self.progress_var.set, 100)
                 
-                messagebox.showinfo("Success", 
-                                  f"Playbook executed successfully!\nReport saved to: {report_path}")
+                self.on_ui(messagebox.showinfo, "Success", 
+                           f"Playbook executed successfully!\nReport saved to: {report_path}")
                 
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to execute playbook: {str(e)}")
-                self.status_var.set("Failed")
+                self.on_ui(messagebox.showerror, "Error", f"Failed to execute playbook: {str(e)}")
+                self.on_ui(self.status_var.set, "Failed")
             finally:
-                self.progress_var.set(0)
+                self.on_ui(self.progress_var.set, 0)
+                self.on_ui(execute_btn.configure, {'state': 'normal'})
         
         # Bind playbook selection to preview update
-        playbook_list.bind('<<ListboxSelect>>', update_preview)
+        playbook_list.bind('<<ListboxSelect>>', schedule_preview)
         
         # Add execute button
         execute_btn = ttk.Button(button_frame, text="Execute Playbook", command=execute_playbook)
         execute_btn.pack(side=tk.RIGHT, padx=5)
         
+        def refresh_playbooks():
+            """Rescan the playbooks directory off the Tk thread"""
+            self.background.submit(scan_playbooks)
+        
+        def scan_playbooks():
+            """List the playbooks; DirectoryManager only rescans when the directory changed"""
+            found = self.dir_manager.get_playbooks()
+            self.on_ui(show_playbooks, found)
+            self.prefetch_playbooks(list(found.values()))
+        
+        def show_playbooks(found: Dict[str, Path]):
+            """Replace the listed playbooks in a single insert, unless nothing changed"""
+            if found == playbooks:
+                return
+            playbooks.clear()
+            playbooks.update(found)
+            playbook_list.delete(0, tk.END)
+            playbook_list.insert(tk.END, *playbooks.keys())
+        
         # Add refresh button
-        refresh_btn = ttk.Button(button_frame, text="Refresh Playbooks", 
-                               command=lambda: [playbook_list.delete(0, tk.END)] + 
-                                            [playbook_list.insert(tk.END, name) 
-                                             for name in dir_manager.get_playbooks().keys()])
+        refresh_btn = ttk.Button(button_frame, text="Refresh Playbooks", command=refresh_playbooks)
         refresh_btn.pack(side=tk.RIGHT, padx=5)
         
-        # Initial population of network tree
-        refresh_network_tree() 
\ No newline at end of file
+        # Initial population of network tree from the devices cached at selection
+        populate_network_tree() 
\ No newline at end of file
@@ -1,7 +1,79 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-import yaml
+import copy
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
+# JSON copy of a playbook written next to its YAML; the YAML stays the file people edit
+SIDECAR_SUFFIX = ".json"
+
+# Resolved path -> ((mtime_ns, size) of the file when parsed, parsed document).
+# The GUI parses from the Tk thread and the background worker at once, so entries
+# are only ever replaced by a single assignment and never iterated or deleted.
+_parsed_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+def _source_signature(stat: os.stat_result) -> Dict[str, int]:
+    """What a sidecar records about the YAML it was written from"""
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def _load_json(path: Path) -> Any:
+    content = Path(path).read_bytes()
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+def save_playbook_fast(playbook: Dict[str, Any], path: Path, source: Path):
+    """Write a playbook document as JSON next to its YAML source, replacing the file atomically"""
+    document = {'source': _source_signature(source.stat()), 'playbook': playbook}
+    if orjson is not None:
+        content = orjson.dumps(document, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(document, indent=2).encode()
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+def load_playbook_fast(path: Path) -> Dict[str, Any]:
+    """Read a playbook document written by save_playbook_fast"""
+    return _load_json(path)['playbook']
+
+def _read_sidecar(path: Path, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """The playbook's JSON sidecar, if it was written from the YAML exactly as it is now"""
+    # mtimes alone can't be trusted: cp -p, rsync -t and restores keep an old one
+    try:
+        document = _load_json(path.with_suffix(SIDECAR_SUFFIX))
+        if document.get('source') != _source_signature(stat):
+            return None
+        return document['playbook']
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    """Parse a playbook file, reusing the last parse while the file is unchanged"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed_cache.get(str(path))
+    data = cached[1] if cached is not None and cached[0] == signature else None
+    if data is None:
+        # A sidecar written from this exact YAML skips the YAML parse altogether
+        data = _read_sidecar(path, stat)
+        if data is None:
+            # PyYAML is only imported once a playbook is actually parsed
+            import yaml
+            try:
+                from yaml import CSafeLoader as SafeLoader
+            except ImportError:  # PyYAML built without libyaml
+                from yaml import SafeLoader
+            with open(path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=SafeLoader)
+        _parsed_cache[str(path)] = (signature, data)
+    # Callers get their own copy so nothing they do can leak into the shared parse
+    return copy.deepcopy(data)
 
 @dataclass
 class ApiCall:
@@ -11,6 +83,32 @@ class ApiCall:
     filters: Dict[str, Any]
     output: str
     requires_device: bool = False
+    output_filter: List[str] = field(default_factory=list)
+    api_parts: Tuple[str, ...] = field(init=False, repr=False)
+    is_network: bool = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Split the endpoint and filter paths once rather than on every call
+        self.api_parts = tuple(self.endpoint.split('.'))
+        self.is_network = self.api_parts[0] == 'networks'
+        self._filter_paths = [(name, name.split('.')) for name in self.output_filter]
+        
+        # Device endpoints always need a serial, whether or not the flag is set
+        self.requires_device = self.requires_device or self.api_parts[0] == 'devices'
+    
+    @classmethod
+    def from_dict(cls, call: Dict[str, Any]) -> 'ApiCall':
+        """Build a step from one entry of a playbook's api_calls list"""
+        api_data = call.get('api', {})
+        return cls(
+            name=call.get('name', ''),
+            endpoint=api_data.get('endpoint', ''),
+            method=api_data.get('method', ''),
+            filters=api_data.get('filters', {}),
+            output=call.get('output', ''),
+            requires_device=api_data.get('requires_device', False),
+            output_filter=api_data.get('output_filter', [])
+        )
     
     @property
     def output_folder(self) -> str:
@@ -19,6 +117,24 @@ class ApiCall:
     @property
     def parameters(self) -> Dict[str, Any]:
         return self.filters
+    
+    def filter_response(self, response: Any) -> Any:
+        """Filter the API response based on output_filter if specified."""
+        if not self.output_filter or not isinstance(response, dict):
+            return response
+            
+        filtered_data = {}
+        for field_name, parts in self._filter_paths:
+            # Handle nested fields with dot notation (e.g., 'staticDns.ip')
+            value = response
+            for part in parts:
+                if isinstance(value, dict):
+                    value = value.get(part)
+                else:
+                    value = None
+                    break
+            filtered_data[field_name] = value
+        return filtered_data
 
 class PlaybookConfig:
     def __init__(self, data: Dict[str, Any]):
@@ -32,34 +148,34 @@ class Playbook:
         self.path = path
         self.config: Optional[PlaybookConfig] = None
         self.api_calls: List[ApiCall] = []
+        self._validated: Optional[bool] = None
         
+    @classmethod
+    def from_yaml(cls, path: Path) -> 'Playbook':
+        """Load a playbook from a YAML file."""
+        playbook = cls(path)
+        playbook.load()
+        return playbook
+    
     def load(self):
         """Load and parse YAML configuration"""
         try:
-            with open(self.path, 'r') as f:
-                data = yaml.safe_load(f)
+            data = _read_yaml(self.path)
             
             self.config = PlaybookConfig(data.get('config', {}))
-            
-            for call in data.get('api_calls', []):
-                api_data = call.get('api', {})
-                self.api_calls.append(ApiCall(
-                    name=call.get('name', ''),
-                    endpoint=api_data.get('endpoint', ''),
-                    method=api_data.get('method', ''),
-                    filters=api_data.get('filters', {}),
-                    output=call.get('output', ''),
-                    requires_device=api_data.get('requires_device', False)
-                ))
+            self.api_calls = [ApiCall.from_dict(call) for call in data.get('api_calls', [])]
+            self._validated = None
         except Exception as e:
             raise ValueError(f"Failed to load playbook: {e}")
     
     def validate(self) -> bool:
-        """Validate playbook structure"""
-        if not self.config or not self.api_calls:
-            return False
-        
-        for call in self.api_calls:
-            if not all([call.name, call.endpoint, call.method, call.output]):
-                return False
-        return True 
\ No newline at end of file
+        """Validate playbook structure, remembering the answer until the next load"""
+        if self._validated is None:
+            self._validated = self._check_structure()
+        return self._validated
+    
+    def _check_structure(self) -> bool:
+        # Stops at the first step with an empty required field
+        return bool(self.config and self.api_calls and
+                    all(call.name and call.endpoint and call.method and call.output
+                        for call in self.api_calls)) 
\ No newline at end of file
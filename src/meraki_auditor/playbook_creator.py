@@ -1,165 +1,249 @@
+import argparse
+import os
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
-import yaml
 from pathlib import Path
-from typing import Dict, List, Optional
-import meraki
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from .playbook import SIDECAR_SUFFIX, save_playbook_fast
 from .utils import DirectoryManager
 
-class PlaybookCreatorGUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Meraki Playbook Creator")
-        self.root.geometry("1000x800")
-        
-        # Initialize Meraki API documentation
-        self.api_endpoints = {
-            "networks": {
-                "devices": {
-                    "method": "getNetworkDevices",
-                    "description": "List the devices in a network",
-                    "parameters": ["networkId"]
-                },
-                "clients": {
-                    "method": "getNetworkClients",
-                    "description": "List the clients in a network",
-                    "parameters": ["networkId", "timespan"]
-                },
-                "vlans": {
-                    "method": "getNetworkVlans",
-                    "description": "List the VLANs in a network",
-                    "parameters": ["networkId"]
-                },
-                "switch": {
-                    "settings": {
-                        "method": "getNetworkSwitchSettings",
-                        "description": "Get switch network settings",
-                        "parameters": ["networkId"]
-                    },
-                    "dhcp": {
-                        "method": "getNetworkSwitchDhcpServerPolicy",
-                        "description": "Get DHCP server policy",
-                        "parameters": ["networkId"]
-                    },
-                    "mtu": {
-                        "method": "getNetworkSwitchMtu",
-                        "description": "Get switch MTU configuration",
-                        "parameters": ["networkId"]
-                    },
-                    "stormControl": {
-                        "method": "getNetworkSwitchStormControl",
-                        "description": "Get storm control configuration",
-                        "parameters": ["networkId"]
-                    }
-                }
+# Playbook file names: the lowercased name with spaces turned into underscores
+# (\w is Unicode-aware, so names like "Übersicht" are fine)
+_SLUG_RE = re.compile(r"[\w\-]+")
+
+_YAML_ESCAPES = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+# Characters a double-quoted YAML scalar can't carry literally: C0/C1 controls, DEL,
+# and the code points YAML folds or treats as line breaks (NEL, LS, PS), plus non-characters
+_YAML_NEEDS_ESCAPE = re.compile(r'[\\"\x00-\x1f\x7f-\x9f\u2028\u2029\ud800-\udfff\ufffe\uffff]')
+
+def _yaml_escape(match) -> str:
+    ch = match.group()
+    escaped = _YAML_ESCAPES.get(ch)
+    if escaped is not None:
+        return escaped
+    code = ord(ch)
+    return f"\\x{code:02X}" if code < 0x100 else f"\\u{code:04X}"
+
+def _yaml_scalar(value: Any) -> str:
+    """Render a scalar the way the bundled playbooks write them"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    # Double-quote every string so ':', '#', leading '-' and friends need no special cases
+    return f'"{_YAML_NEEDS_ESCAPE.sub(_yaml_escape, str(value))}"'
+
+def _emit_playbook_yaml(playbook: Dict) -> str:
+    """Write a playbook document as YAML without going through PyYAML's emitter"""
+    config = playbook["config"]
+    lines = ["config:\n"]
+    for key in ("name", "description", "version", "author"):
+        lines.append(f"  {key}: {_yaml_scalar(config.get(key, ''))}\n")
+    
+    calls = playbook["api_calls"]
+    if not calls:
+        lines.append("\napi_calls: []\n")
+        return "".join(lines)
+    
+    lines.append("\napi_calls:\n")
+    for call in calls:
+        api = call["api"]
+        lines.append(f"  - name: {_yaml_scalar(call['name'])}\n")
+        lines.append("    api:\n")
+        lines.append(f"      endpoint: {_yaml_scalar(api['endpoint'])}\n")
+        lines.append(f"      method: {_yaml_scalar(api['method'])}\n")
+        if "requires_device" in api:
+            lines.append(f"      requires_device: {_yaml_scalar(api['requires_device'])}\n")
+        if api.get("filters"):
+            lines.append("      filters:\n")
+            for key, value in api["filters"].items():
+                lines.append(f"        {key}: {_yaml_scalar(value)}\n")
+        lines.append(f"    output: {_yaml_scalar(call['output'])}\n")
+    return "".join(lines)
+
+# Meraki API documentation: categories nest down to endpoint records that carry a "method".
+# Shared by every creator window and read-only.
+API_ENDPOINTS = MappingProxyType({
+    "networks": {
+        "devices": {
+            "method": "getNetworkDevices",
+            "description": "List the devices in a network",
+            "parameters": ["networkId"]
+        },
+        "clients": {
+            "method": "getNetworkClients",
+            "description": "List the clients in a network",
+            "parameters": ["networkId", "timespan"]
+        },
+        "vlans": {
+            "method": "getNetworkVlans",
+            "description": "List the VLANs in a network",
+            "parameters": ["networkId"]
+        },
+        "switch": {
+            "settings": {
+                "method": "getNetworkSwitchSettings",
+                "description": "Get switch network settings",
+                "parameters": ["networkId"]
             },
-            "devices": {
-                "switch": {
-                    "ports": {
-                        "method": "getDeviceSwitchPorts",
-                        "description": "List the switch ports for a device",
-                        "parameters": ["serial"]
-                    },
-                    "portSchedules": {
-                        "method": "getDeviceSwitchPortSchedules",
-                        "description": "List port schedules for a switch",
-                        "parameters": ["serial"]
-                    },
-                    "routingInterfaces": {
-                        "method": "getDeviceSwitchRoutingInterfaces",
-                        "description": "List switch routing interfaces",
-                        "parameters": ["serial"]
-                    },
-                    "dhcp": {
-                        "method": "getDeviceSwitchWarmSpare",
-                        "description": "Get switch DHCP settings",
-                        "parameters": ["serial"]
-                    },
-                    "poe": {
-                        "method": "getDeviceSwitchPortsStatuses",
-                        "description": "Get PoE status for all ports",
-                        "parameters": ["serial"]
-                    }
-                },
-                "management": {
-                    "interface": {
-                        "method": "getDeviceManagementInterface",
-                        "description": "Get device management interface settings",
-                        "parameters": ["serial"]
-                    }
-                },
-                "lldp": {
-                    "cdp": {
-                        "method": "getDeviceLldpCdp",
-                        "description": "Get LLDP and CDP information",
-                        "parameters": ["serial"]
-                    }
-                }
+            "dhcp": {
+                "method": "getNetworkSwitchDhcpServerPolicy",
+                "description": "Get DHCP server policy",
+                "parameters": ["networkId"]
             },
-            "organizations": {
-                "networks": {
-                    "method": "getOrganizationNetworks",
-                    "description": "List the networks in an organization",
-                    "parameters": ["organizationId"]
-                },
-                "devices": {
-                    "method": "getOrganizationDevices",
-                    "description": "List the devices in an organization",
-                    "parameters": ["organizationId"]
-                },
-                "inventory": {
-                    "method": "getOrganizationInventoryDevices",
-                    "description": "List organization inventory devices",
-                    "parameters": ["organizationId"]
-                },
-                "licenses": {
-                    "method": "getOrganizationLicenses",
-                    "description": "List organization licenses",
-                    "parameters": ["organizationId"]
-                }
+            "mtu": {
+                "method": "getNetworkSwitchMtu",
+                "description": "Get switch MTU configuration",
+                "parameters": ["networkId"]
             },
-            "switch": {
-                "accessPolicies": {
-                    "method": "getNetworkSwitchAccessPolicies",
-                    "description": "List access policies for a network",
-                    "parameters": ["networkId"]
-                },
-                "portSchedules": {
-                    "method": "getNetworkSwitchPortSchedules",
-                    "description": "List network port schedules",
-                    "parameters": ["networkId"]
-                },
-                "qosRules": {
-                    "method": "getNetworkSwitchQosRules",
-                    "description": "List QoS rules",
-                    "parameters": ["networkId"]
-                },
-                "stp": {
-                    "method": "getNetworkSwitchStp",
-                    "description": "Get STP settings",
-                    "parameters": ["networkId"]
-                }
+            "stormControl": {
+                "method": "getNetworkSwitchStormControl",
+                "description": "Get storm control configuration",
+                "parameters": ["networkId"]
+            }
+        }
+    },
+    "devices": {
+        "switch": {
+            "ports": {
+                "method": "getDeviceSwitchPorts",
+                "description": "List the switch ports for a device",
+                "parameters": ["serial"]
             },
-            "monitoring": {
-                "devices": {
-                    "uplink": {
-                        "method": "getOrganizationDevicesUplinksLossAndLatency",
-                        "description": "Get uplink loss and latency for devices",
-                        "parameters": ["organizationId", "timespan"]
-                    },
-                    "status": {
-                        "method": "getOrganizationDevicesStatuses",
-                        "description": "Get device statuses",
-                        "parameters": ["organizationId"]
-                    }
-                },
-                "alerts": {
-                    "method": "getOrganizationAlertsProfiles",
-                    "description": "List alert configurations",
-                    "parameters": ["organizationId"]
-                }
+            "portSchedules": {
+                "method": "getDeviceSwitchPortSchedules",
+                "description": "List port schedules for a switch",
+                "parameters": ["serial"]
+            },
+            "routingInterfaces": {
+                "method": "getDeviceSwitchRoutingInterfaces",
+                "description": "List switch routing interfaces",
+                "parameters": ["serial"]
+            },
+            "dhcp": {
+                "method": "getDeviceSwitchWarmSpare",
+                "description": "Get switch DHCP settings",
+                "parameters": ["serial"]
+            },
+            "poe": {
+                "method": "getDeviceSwitchPortsStatuses",
+                "description": "Get PoE status for all ports",
+                "parameters": ["serial"]
             }
+        },
+        "management": {
+            "interface": {
+                "method": "getDeviceManagementInterface",
+                "description": "Get device management interface settings",
+                "parameters": ["serial"]
+            }
+        },
+        "lldp": {
+            "cdp": {
+                "method": "getDeviceLldpCdp",
+                "description": "Get LLDP and CDP information",
+                "parameters": ["serial"]
+            }
+        }
+    },
+    "organizations": {
+        "networks": {
+            "method": "getOrganizationNetworks",
+            "description": "List the networks in an organization",
+            "parameters": ["organizationId"]
+        },
+        "devices": {
+            "method": "getOrganizationDevices",
+            "description": "List the devices in an organization",
+            "parameters": ["organizationId"]
+        },
+        "inventory": {
+            "method": "getOrganizationInventoryDevices",
+            "description": "List organization inventory devices",
+            "parameters": ["organizationId"]
+        },
+        "licenses": {
+            "method": "getOrganizationLicenses",
+            "description": "List organization licenses",
+            "parameters": ["organizationId"]
+        }
+    },
+    "switch": {
+        "accessPolicies": {
+            "method": "getNetworkSwitchAccessPolicies",
+            "description": "List access policies for a network",
+            "parameters": ["networkId"]
+        },
+        "portSchedules": {
+            "method": "getNetworkSwitchPortSchedules",
+            "description": "List network port schedules",
+            "parameters": ["networkId"]
+        },
+        "qosRules": {
+            "method": "getNetworkSwitchQosRules",
+            "description": "List QoS rules",
+            "parameters": ["networkId"]
+        },
+        "stp": {
+            "method": "getNetworkSwitchStp",
+            "description": "Get STP settings",
+            "parameters": ["networkId"]
         }
+    },
+    "monitoring": {
+        "devices": {
+            "uplink": {
+                "method": "getOrganizationDevicesUplinksLossAndLatency",
+                "description": "Get uplink loss and latency for devices",
+                "parameters": ["organizationId", "timespan"]
+            },
+            "status": {
+                "method": "getOrganizationDevicesStatuses",
+                "description": "Get device statuses",
+                "parameters": ["organizationId"]
+            }
+        },
+        "alerts": {
+            "method": "getOrganizationAlertsProfiles",
+            "description": "List alert configurations",
+            "parameters": ["organizationId"]
+        }
+    }
+})
+
+def _flatten_endpoints(tree: Mapping) -> Dict[Tuple[str, ...], Dict]:
+    """Map each endpoint's full path to its record, in tree order"""
+    flat = {}
+    # Depth-first with an explicit stack; children go on reversed so they pop in order
+    stack = [((key,), value) for key, value in reversed(list(tree.items()))]
+    while stack:
+        path, value = stack.pop()
+        if "method" in value:
+            flat[path] = value
+        else:
+            stack.extend((path + (key,), child) for key, child in reversed(list(value.items())))
+    return flat
+
+# Built once at import; endpoint lookups are a single hash instead of a walk down the tree
+_FLAT_ENDPOINTS = _flatten_endpoints(API_ENDPOINTS)
+
+class PlaybookCreatorGUI:
+    def __init__(self, legacy_yaml: bool = False):
+        self.root = tk.Tk()
+        self.root.title("Meraki Playbook Creator")
+        self.root.geometry("1000x800")
+        # Save through yaml.dump instead of the built-in writer, for comparing output
+        self.legacy_yaml = legacy_yaml
+        self.dir_manager = DirectoryManager()
+        # Playbook entries for the rows of the calls tree, keyed by row id in display order
+        self._calls_data: Dict[str, Dict] = {}
+        self._next_iid = 0
+        # Endpoint node id in the API tree -> its full path in _FLAT_ENDPOINTS
+        self._iid_to_path: Dict[str, Tuple[str, ...]] = {}
         
         self.setup_ui()
     
@@ -174,10 +258,10 @@ class PlaybookCreatorGUI:
         
         # API Treeview
         self.api_tree = ttk.Treeview(api_frame)
-        self.api_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Populate API tree
+        # Populate API tree before it is packed so the inserts are never laid out one by one
         self._populate_api_tree()
+        self.api_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Right panel - Playbook Builder
         builder_frame = ttk.LabelFrame(main_frame, text="Playbook Builder", padding="5")
@@ -189,18 +273,18 @@ class PlaybookCreatorGUI:
         
         # Name
         ttk.Label(metadata_frame, text="Name:").grid(row=0, column=0, sticky="e", padx=5)
-        self.name_var = tk.StringVar()
-        ttk.Entry(metadata_frame, textvariable=self.name_var).grid(row=0, column=1, sticky="ew")
+        self.name_entry = ttk.Entry(metadata_frame)
+        self.name_entry.grid(row=0, column=1, sticky="ew")
         
         # Description
         ttk.Label(metadata_frame, text="Description:").grid(row=1, column=0, sticky="e", padx=5)
-        self.desc_var = tk.StringVar()
-        ttk.Entry(metadata_frame, textvariable=self.desc_var).grid(row=1, column=1, sticky="ew")
+        self.desc_entry = ttk.Entry(metadata_frame)
+        self.desc_entry.grid(row=1, column=1, sticky="ew")
         
         # Author
         ttk.Label(metadata_frame, text="Author:").grid(row=2, column=0, sticky="e", padx=5)
-        self.author_var = tk.StringVar()
-        ttk.Entry(metadata_frame, textvariable=self.author_var).grid(row=2, column=1, sticky="ew")
+        self.author_entry = ttk.Entry(metadata_frame)
+        self.author_entry.grid(row=2, column=1, sticky="ew")
         
         # API Calls List
         calls_frame = ttk.LabelFrame(builder_frame, text="API Calls", padding="5")
@@ -226,19 +310,15 @@ class PlaybookCreatorGUI:
     
     def _populate_api_tree(self):
         """Populate the API endpoint tree"""
-        def add_node(parent, key, value):
-            node = self.api_tree.insert(parent, "end", text=key)
-            if isinstance(value, dict):
-                if "method" in value:
-                    # This is an endpoint
-                    self.api_tree.item(node, tags=("endpoint",))
-                else:
-                    # This is a category
-                    for k, v in value.items():
-                        add_node(node, k, v)
-        
-        for key, value in self.api_endpoints.items():
-            add_node("", key, value)
+        # Category path -> tree node, created the first time an endpoint below it shows up
+        nodes: Dict[Tuple[str, ...], str] = {(): ""}
+        for path in _FLAT_ENDPOINTS:
+            for depth in range(1, len(path)):
+                category = path[:depth]
+                if category not in nodes:
+                    nodes[category] = self.api_tree.insert(nodes[category[:-1]], "end", text=category[-1])
+            node = self.api_tree.insert(nodes[path[:-1]], "end", text=path[-1], tags=("endpoint",))
+            self._iid_to_path[node] = path
     
     def _add_api_call(self):
         """Add selected API endpoint to the playbook"""
@@ -247,26 +327,13 @@ class PlaybookCreatorGUI:
             messagebox.showwarning("Warning", "Please select an API endpoint")
             return
         
-        item = self.api_tree.item(selected[0])
-        if "endpoint" not in item.get("tags", []):
+        # Only endpoint nodes have a recorded path; categories fall through to the warning
+        path = self._iid_to_path.get(selected[0])
+        if path is None:
             messagebox.showwarning("Warning", "Please select an endpoint (leaf node)")
             return
         
-        # Get the full endpoint path and data
-        path = []
-        parent = selected[0]
-        while parent:
-            path.insert(0, self.api_tree.item(parent)["text"])
-            parent = self.api_tree.parent(parent)
-        
-        endpoint_data = self.api_endpoints
-        for part in path:
-            endpoint_data = endpoint_data[part]
-        
-        if "method" not in endpoint_data:
-            messagebox.showerror("Error", "Invalid endpoint selected")
-            return
-        
+        endpoint_data = _FLAT_ENDPOINTS[path]
         endpoint = ".".join(path)
         
         # Show dialog for additional details
@@ -292,13 +359,15 @@ class PlaybookCreatorGUI:
         
         # Name
         ttk.Label(form_frame, text="Name:").pack(anchor=tk.W, pady=(0, 2))
-        name_var = tk.StringVar(value=f"get_{path[-1]}")
-        ttk.Entry(form_frame, textvariable=name_var).pack(fill=tk.X, pady=(0, 10))
+        name_entry = ttk.Entry(form_frame)
+        name_entry.insert(0, f"get_{path[-1]}")
+        name_entry.pack(fill=tk.X, pady=(0, 10))
         
         # Output Folder
         ttk.Label(form_frame, text="Output Folder:").pack(anchor=tk.W, pady=(0, 2))
-        output_var = tk.StringVar(value=path[-1])
-        ttk.Entry(form_frame, textvariable=output_var).pack(fill=tk.X, pady=(0, 10))
+        output_entry = ttk.Entry(form_frame)
+        output_entry.insert(0, path[-1])
+        output_entry.pack(fill=tk.X, pady=(0, 10))
         
         # Parameters section
         ttk.Label(form_frame, text="Parameters:", font=("", 0, "bold")).pack(anchor=tk.W, pady=(10, 5))
@@ -309,8 +378,8 @@ class PlaybookCreatorGUI:
             ttk.Label(form_frame, text="⚠️ This endpoint requires device serial numbers", 
                      foreground="orange").pack(anchor=tk.W, pady=(0, 5))
         
-        # Parameter configuration
-        param_vars = {}
+        # Parameter configuration; entries are read directly when the call is added
+        param_entries = {}
         for param in endpoint_data.get('parameters', []):
             param_frame = ttk.Frame(form_frame)
             param_frame.pack(fill=tk.X, pady=2)
@@ -328,8 +397,8 @@ class PlaybookCreatorGUI:
                 continue
             
             ttk.Label(param_frame, text=f"{param}:").pack(side=tk.LEFT)
-            param_vars[param] = tk.StringVar()
-            ttk.Entry(param_frame, textvariable=param_vars[param]).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+            param_entries[param] = ttk.Entry(param_frame)
+            param_entries[param].pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Show endpoint details
         ttk.Label(form_frame, text="Endpoint Details:", font=("", 0, "bold")).pack(anchor=tk.W, pady=(10, 2))
@@ -340,29 +409,35 @@ class PlaybookCreatorGUI:
         details_label = ttk.Label(form_frame, text=details_text, wraplength=450, justify=tk.LEFT)
         details_label.pack(anchor=tk.W, pady=(0, 10))
         
-        def add_call():
+        # The dialog's inputs are bound as defaults so add_call reads them as locals,
+        # not closure cells; only the row counter, which it advances, stays on self
+        def add_call(endpoint=endpoint, method=endpoint_data['method'],
+                     requires_device=requires_device, param_entries=param_entries,
+                     name_entry=name_entry, output_entry=output_entry,
+                     tree=self.calls_tree, calls_data=self._calls_data, dialog=dialog):
             # Create filters dictionary for any provided parameters
-            filters = {k: v.get() for k, v in param_vars.items() if v.get()}
+            param_values = {k: e.get() for k, e in param_entries.items()}
+            filters = {k: v for k, v in param_values.items() if v}
+            name = name_entry.get()
+            output = output_entry.get()
             
-            self.calls_tree.insert("", "end", values=(
-                name_var.get(),
-                endpoint,
-                endpoint_data['method'],
-                output_var.get()
-            ))
+            row = str(self._next_iid)
+            self._next_iid += 1
+            tree.insert("", "end", iid=row, values=(name, endpoint, method, output))
             
             # Update the saved call data to include requires_device flag
             call_data = {
-                "name": name_var.get(),
+                "name": name,
                 "api": {
                     "endpoint": endpoint,
-                    "method": endpoint_data['method'],
+                    "method": method,
                     "requires_device": requires_device
                 },
-                "output": output_var.get()
+                "output": output
             }
             if filters:
                 call_data["api"]["filters"] = filters
+            calls_data[row] = call_data
             
             dialog.destroy()
         
@@ -384,45 +459,75 @@ class PlaybookCreatorGUI:
         selected = self.calls_tree.selection()
         if selected:
             self.calls_tree.delete(selected[0])
+            del self._calls_data[selected[0]]
     
     def _save_playbook(self):
         """Save the playbook to a YAML file"""
-        if not self.name_var.get():
+        name = self.name_entry.get()
+        if not name:
             messagebox.showerror("Error", "Playbook name is required")
             return
         
+        # Settle the file name before building anything, so a bad name costs nothing
+        slug = name.strip().lower().replace(' ', '_')
+        if not _SLUG_RE.fullmatch(slug):
+            messagebox.showerror("Error", "Playbook name may only use letters, digits, spaces, '_' and '-'")
+            return
+        file_path = self.dir_manager.playbooks_dir / f"{slug}.yaml"
+        try:
+            # Non-ASCII names need a filesystem encoding that can spell them
+            os.fsencode(file_path)
+        except UnicodeEncodeError:
+            messagebox.showerror("Error", "Playbook name can't be used as a file name with this system's encoding")
+            return
+        
         playbook = {
             "config": {
-                "name": self.name_var.get(),
-                "description": self.desc_var.get(),
+                "name": name,
+                "description": self.desc_entry.get(),
                 "version": "1.0",
-                "author": self.author_var.get()
+                "author": self.author_entry.get()
             },
-            "api_calls": []
+            # Rows are only ever appended, so the dict is already in tree order
+            "api_calls": list(self._calls_data.values())
         }
         
-        for item in self.calls_tree.get_children():
-            values = self.calls_tree.item(item)["values"]
-            playbook["api_calls"].append({
-                "name": values[0],
-                "api": {
-                    "endpoint": values[1],
-                    "method": values[2]
-                },
-                "output": values[3]
-            })
-        
-        # Save to file
-        dir_manager = DirectoryManager()
-        file_path = dir_manager.playbooks_dir / f"{self.name_var.get().lower().replace(' ', '_')}.yaml"
-        
-        with open(file_path, 'w') as f:
-            yaml.dump(playbook, f, sort_keys=False)
+        if self.legacy_yaml:
+            import yaml
+            try:
+                from yaml import CSafeDumper as SafeDumper
+            except ImportError:  # PyYAML built without libyaml
+                from yaml import SafeDumper
+            text = yaml.dump(playbook, Dumper=SafeDumper, sort_keys=False, default_flow_style=False)
+        else:
+            text = _emit_playbook_yaml(playbook)
+        
+        # One write to a temporary file, then swap it in so a crash never leaves half a playbook
+        # Always UTF-8: the built-in writer keeps non-ASCII text as is, whatever the locale
+        tmp_path = file_path.with_suffix('.yaml.tmp')
+        try:
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, file_path)
+        except (OSError, UnicodeError) as e:
+            # Don't leave a half-written .yaml.tmp behind
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            messagebox.showerror("Error", f"Failed to save playbook: {e}")
+            return
+        # Records the YAML's size and mtime so the auditor only trusts it for this exact file
+        save_playbook_fast(playbook, file_path.with_suffix(SIDECAR_SUFFIX), file_path)
         
         messagebox.showinfo("Success", f"Playbook saved to {file_path}")
 
 def main():
-    app = PlaybookCreatorGUI()
+    parser = argparse.ArgumentParser(description="Meraki Playbook Creator")
+    parser.add_argument("--legacy-yaml", action="store_true",
+                        help="save playbooks with yaml.dump instead of the built-in writer")
+    args = parser.parse_args()
+    
+    app = PlaybookCreatorGUI(legacy_yaml=args.legacy_yaml)
     app.root.mainloop()
 
 if __name__ == "__main__":
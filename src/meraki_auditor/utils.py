@@ -1,31 +1,147 @@
 from pathlib import Path
+import hashlib
+import json
 import os
-import yaml
-from typing import Dict, Optional
-from datetime import datetime
+import time
+from typing import Dict, List, Optional, Set
+
+# Network and device inventories rarely change within a working session
+CACHE_TTL = 3600
+DEVICE_CACHE_TTL_ENV = "MERAKI_DEVICE_CACHE_TTL"
+# Suffix stamped on report directories and the files inside them
+REPORT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Default locations, resolved once at import rather than per DirectoryManager
+_BASE_DIR = Path(__file__).resolve().parent.parent.parent
+_PLAYBOOKS_DIR = _BASE_DIR / "playbooks"
+_REPORTS_DIR = _BASE_DIR / "reports"
 
 class DirectoryManager:
+    # Directories already created by this process; creating them again is wasted syscalls
+    _ensured: Set[Path] = set()
+    
     def __init__(self, base_dir: Optional[Path] = None):
-        self.base_dir = base_dir or Path(__file__).parent.parent.parent
-        self.playbooks_dir = self.base_dir / "playbooks"
-        self.reports_dir = self.base_dir / "reports"
+        if base_dir is None:
+            self.base_dir = _BASE_DIR
+            self.playbooks_dir = _PLAYBOOKS_DIR
+            self.reports_dir = _REPORTS_DIR
+        else:
+            self.base_dir = base_dir
+            self.playbooks_dir = base_dir / "playbooks"
+            self.reports_dir = base_dir / "reports"
+        # Last playbook listing and the directory mtime (ns) it was read at
+        self._pb_cache: Optional[Dict[str, Path]] = None
+        self._pb_mtime = -1
         self.ensure_directories()
     
     def ensure_directories(self):
         """Create necessary directories if they don't exist"""
         for directory in [self.playbooks_dir, self.reports_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            if directory in DirectoryManager._ensured:
+                continue
+            # A stat is cheaper than a mkdir that fails with EEXIST in the usual case
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+            DirectoryManager._ensured.add(directory)
     
     def get_playbooks(self) -> Dict[str, Path]:
-        """Return dictionary of available playbooks"""
-        playbooks = {}
-        for file in self.playbooks_dir.glob("*.yaml"):
-            playbooks[file.stem] = file
-        return playbooks
-    
-    def create_report_directory(self, report_name: str) -> Path:
-        """Create a new directory for a report"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """Return dictionary of available playbooks, rescanning only when the directory changed"""
+        try:
+            mtime = os.stat(self.playbooks_dir).st_mtime_ns
+        except FileNotFoundError:
+            # Removed since ensure_directories ran; there is nothing to list
+            self._pb_cache = None
+            return {}
+        if mtime != self._pb_mtime or self._pb_cache is None:
+            playbooks = {}
+            with os.scandir(self.playbooks_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.yaml') and entry.is_file():
+                        playbooks[entry.name[:-5]] = Path(entry.path)
+            self._pb_cache = playbooks
+            self._pb_mtime = mtime
+        # Callers may edit their copy, so never hand out the cached dict itself
+        return dict(self._pb_cache)
+    
+    def create_report_directory(self, report_name: str, timestamp: Optional[str] = None) -> Path:
+        """Create a new directory for a report, stamped now unless a timestamp is given"""
+        timestamp = timestamp or time.strftime(REPORT_TIMESTAMP_FORMAT)
         report_dir = self.reports_dir / f"{report_name}_{timestamp}"
         report_dir.mkdir(parents=True, exist_ok=True)
-        return report_dir 
\ No newline at end of file
+        return report_dir
+
+
+class DeviceCache:
+    """Per-network JSON files of device lists, trusted until older than a TTL"""
+    
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: Optional[float] = None):
+        self.cache_dir = cache_dir or Path.home() / ".cache" / "meraki_auditor" / "devices"
+        # An explicit TTL wins; otherwise MERAKI_DEVICE_CACHE_TTL, then CACHE_TTL. 0 turns the cache off
+        if ttl is None:
+            try:
+                ttl = float(os.environ.get(DEVICE_CACHE_TTL_ENV, CACHE_TTL))
+            except ValueError:
+                ttl = CACHE_TTL
+        self.ttl = ttl
+    
+    def _path(self, network_id: str) -> Path:
+        return self.cache_dir / f"{network_id}.json"
+    
+    def get(self, network_id: str, ttl: Optional[float] = None) -> Optional[List[Dict]]:
+        """Return cached devices for a network, or None if missing or stale"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return None
+        path = self._path(network_id)
+        try:
+            if time.time() - path.stat().st_mtime > ttl:
+                return None
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, network_id: str, devices: List[Dict]):
+        """Remember the devices for a network, replacing its file atomically"""
+        if self.ttl <= 0:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(network_id)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(devices, f)
+        os.replace(tmp_path, path)
+
+
+class NetworkCache:
+    """JSON file of an account's networks, trusted until its mtime is older than a TTL"""
+    
+    def __init__(self, api_key: str, ttl: Optional[float] = None, cache_dir: Optional[Path] = None):
+        # Key the file by a hash so the API key itself never lands on disk
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:8]
+        cache_dir = cache_dir or Path.home() / ".cache" / "meraki_auditor"
+        self.path = cache_dir / f"networks_{key_hash}.json"
+        # A TTL of 0 or less turns the cache off, as it does for DeviceCache
+        self.ttl = CACHE_TTL if ttl is None else ttl
+    
+    def load(self) -> Optional[List[Dict]]:
+        """Return the cached networks, or None if missing or stale"""
+        if self.ttl <= 0:
+            return None
+        try:
+            if time.time() - self.path.stat().st_mtime > self.ttl:
+                return None
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def save(self, networks: List[Dict]):
+        """Replace the cached networks atomically"""
+        if self.ttl <= 0:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(networks, f)
+        os.replace(tmp_path, self.path)
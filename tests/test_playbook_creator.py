@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from meraki_auditor import playbook_creator
+from meraki_auditor.playbook import Playbook
+from meraki_auditor.playbook_creator import PlaybookCreatorGUI, _emit_playbook_yaml
+from meraki_auditor.utils import DirectoryManager
+
+
+def _playbook(name="Audit", description="", calls=()):
+    return {
+        "config": {"name": name, "description": description, "version": "1.0", "author": ""},
+        "api_calls": list(calls),
+    }
+
+
+class EmitPlaybookYamlTest(unittest.TestCase):
+    def assertRoundTrips(self, playbook):
+        text = _emit_playbook_yaml(playbook)
+        self.assertEqual(yaml.safe_load(text.encode("utf-8")), playbook)
+
+    def test_yaml_syntax_characters(self):
+        self.assertRoundTrips(_playbook(name='A: #b "q" \\ x', description="- starts with a dash"))
+
+    def test_control_and_line_break_characters(self):
+        special = "".join(chr(c) for c in range(0x00, 0xA0)) + "\u2028\u2029\ufffe\uffff"
+        self.assertRoundTrips(_playbook(name="bell\x07 nel\x85 end", description=special))
+
+    def test_non_ascii_text(self):
+        self.assertRoundTrips(_playbook(name="Übersicht", description="日本語 \U0001F600"))
+
+    def test_api_calls(self):
+        call = {
+            "name": "get_ports",
+            "api": {
+                "endpoint": "devices.switch.ports",
+                "method": "getDeviceSwitchPorts",
+                "requires_device": True,
+                "filters": {"timespan": "86400", "perPage": 10},
+            },
+            "output": "ports",
+        }
+        self.assertRoundTrips(_playbook(calls=[call]))
+
+    def test_no_api_calls(self):
+        self.assertRoundTrips(_playbook())
+
+
+class _Field:
+    """Stands in for a ttk.Entry; _save_playbook only calls get()"""
+    def __init__(self, text):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+
+def save_playbook(base_dir, name, description):
+    """Run PlaybookCreatorGUI._save_playbook without a Tk window
+
+    Returns the saved YAML path, or None, and the mocked messagebox.
+    """
+    creator = PlaybookCreatorGUI.__new__(PlaybookCreatorGUI)
+    creator.legacy_yaml = False
+    creator.dir_manager = DirectoryManager(Path(base_dir))
+    creator.name_entry = _Field(name)
+    creator.desc_entry = _Field(description)
+    creator.author_entry = _Field("")
+    creator._calls_data = {"0": {
+        "name": "get_vlans",
+        "api": {"endpoint": "networks.vlans", "method": "getNetworkVlans", "requires_device": False},
+        "output": "vlans",
+    }}
+    with mock.patch.object(playbook_creator, "messagebox") as messagebox:
+        creator._save_playbook()
+    saved = list(creator.dir_manager.playbooks_dir.glob("*.yaml"))
+    return (saved[0] if saved else None), messagebox
+
+
+def leftover_temp_files(base_dir):
+    return [p.name for p in (Path(base_dir) / "playbooks").iterdir() if p.suffix == ".tmp"]
+
+
+class SavePlaybookTest(unittest.TestCase):
+    def assertSavesAndLoads(self, name, description):
+        with tempfile.TemporaryDirectory() as base_dir:
+            path, messagebox = save_playbook(base_dir, name, description)
+            messagebox.showerror.assert_not_called()
+            playbook = Playbook.from_yaml(path)
+            self.assertTrue(playbook.validate())
+            self.assertEqual((playbook.config.name, playbook.config.description), (name, description))
+            self.assertEqual(leftover_temp_files(base_dir), [])
+
+    def run_in_ascii_locale(self, script):
+        # Without locale coercion or UTF-8 mode both file contents and file names default to ASCII
+        env = dict(os.environ, LC_ALL="POSIX", PYTHONCOERCECLOCALE="0", PYTHONUTF8="0")
+        prelude = ("import sys, tempfile; sys.path.insert(0, sys.argv[1])\n"
+                   "import test_playbook_creator as t\n"
+                   "from meraki_auditor.playbook import Playbook\n")
+        result = subprocess.run([sys.executable, "-c", prelude + script, str(Path(__file__).parent)],
+                                env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_round_trip(self):
+        self.assertSavesAndLoads("Client Audit", "Übersicht 日本語")
+
+    def test_unicode_name(self):
+        # Unicode letters are allowed in names, so they end up in the file name too
+        self.assertSavesAndLoads("Übersicht Geräte", "")
+
+    def test_ascii_locale_contents(self):
+        self.run_in_ascii_locale(
+            "with tempfile.TemporaryDirectory() as d:\n"
+            "    path, messagebox = t.save_playbook(d, 'Audit', '\\u00dcbersicht')\n"
+            "    assert not messagebox.showerror.called\n"
+            "    assert Playbook.from_yaml(path).config.description == '\\u00dcbersicht'\n"
+        )
+
+    def test_ascii_locale_unicode_name(self):
+        # A name the filesystem encoding can't spell is refused up front, leaving nothing behind
+        self.run_in_ascii_locale(
+            "with tempfile.TemporaryDirectory() as d:\n"
+            "    path, messagebox = t.save_playbook(d, '\\u00dcbersicht', '')\n"
+            "    assert path is None and messagebox.showerror.called\n"
+            "    assert t.leftover_temp_files(d) == []\n"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()